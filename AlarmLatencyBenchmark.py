@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 6:05 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/AlarmLatencyBenchmark.py
+
+Measure time from a detector turning dead on the DAQ Monitor page to the chime and alarm starting. A simulated monitor
+page is served locally and updated on a fixed period like the real one, with detectors scripted to die and recover.
+The full watcher runs against it for each configuration (page source, loop_sleep, adaptive_poll) with sounds logged
+instead of played. Latencies are measured against when the simulated page actually showed each death.
+
+Usage: python AlarmLatencyBenchmark.py [--backends http selenium] [--loop-sleeps 0.25 1] [--run-time 60]
+
+@author: Dylan Neff, Dylan
+"""
+
+import random
+import argparse
+from time import time, sleep
+from threading import Thread, Event
+from itertools import product
+
+from DaqWatcher import DaqWatcher
+from DaqFrameServer import FrameServer
+from DaqMetrics import percentiles
+from DaqReplay import SoundLog
+
+
+class QuietLog:
+    """
+    Stands in for the GUI, drops status lines and state events
+    """
+
+    def print_status(self, status):
+        pass
+
+    def watcher_event(self, event, value):
+        pass
+
+
+class SimulatedMonitor:
+    """
+    DAQ Monitor stand-in. Serves left, main and header frames from a FrameServer and updates them every page_period
+    seconds, showing detector deaths from a failure script at the first update after they're due.
+    """
+
+    def __init__(self, dets, failures, page_period=2.0):
+        """
+        :param dets: Lower case detector names to show
+        :param failures: List of (s after start, detector, s dead) to show
+        :param page_period: s Time between page updates
+        """
+        self.dets = dets
+        self.failures = failures
+        self.page_period = page_period
+        self.server = FrameServer()
+        self.start_time = None
+        self.onsets = {}  # Index into failures -> time page first showed the death
+        self.stop_event = Event()
+        self.thread = None
+
+    @property
+    def url(self):
+        return self.server.url
+
+    def start(self):
+        self.start_time = time()
+        self.update()
+        self.server.start()
+        self.thread = Thread(target=self.update_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.server.stop()
+
+    def update_loop(self):
+        while not self.stop_event.wait(self.page_period - (time() - self.start_time) % self.page_period):
+            self.update()
+
+    def update(self):
+        elapsed = time() - self.start_time
+        dead = set()
+        for index, (offset, det, length) in enumerate(self.failures):
+            if offset <= elapsed < offset + length:
+                dead.add(det)
+                self.onsets.setdefault(index, None)
+        self.server.set_frames(monitor_frames(self.dets, dead, 600 + int(elapsed)))
+        for index in self.onsets:
+            if self.onsets[index] is None:
+                self.onsets[index] = time()  # Page shows it from now on
+
+
+def monitor_frames(dets, dead, duration):
+    """
+    Frame documents laid out like the DAQ Monitor, enough for the watcher's xpaths
+    :param dets: Lower case detector names
+    :param dead: Names of detectors to show dead
+    :param duration: s Run duration to show
+    :return: Dictionary of frame name -> html document
+    """
+
+    reload = "parent.frames['main'].location.reload(); parent.frames['header'].location.reload(); location.reload();"
+    left = f'<html><body><button id="reload" onclick="{reload}">Reload</button>' \
+           f'<span id="run_state">RUNNING</span></body></html>'
+    minutes, seconds = divmod(duration, 60)
+    header = f'<html><body><div id="duration">0 days, 0 hr, {minutes} min, {seconds} s</div></body></html>'
+    det_rows = ''.join(f'<tr><td>{det.upper()}</td><td>0</td><td class="{"sca_red" if det in dead else "running"}">'
+                       f'{99 if det in dead else 3}%</td></tr>' for det in dets)
+    main = f'<html><body><table id="det"><tbody><tr><th>Det</th><th></th><th>Dead</th></tr>{det_rows}</tbody></table>' \
+           f'<table id="trg2"><tbody><tr><td>name</td><td></td><td>hz</td></tr>' \
+           f'<tr><td>ALL</td><td></td><td>{1000 + duration % 7}</td></tr></tbody></table></body></html>'
+    return {'left': left, 'main': main, 'header': header}
+
+
+def failure_script(dets, run_time, alarm_time, seed=0):
+    """
+    Detector deaths spread through the run, one at a time, at random phases relative to page updates
+    :param dets: Detector names to kill
+    :param run_time: s Length of run
+    :param alarm_time: s Alarm time of detectors, deaths last a few seconds longer so alarm sounds
+    :param seed: Random seed, same script every time by default
+    :return: List of (s after start, detector, s dead)
+    """
+
+    rng = random.Random(seed)
+    length = alarm_time + 4
+    failures, offset = [], 5 + rng.uniform(0, 2)
+    while offset + length + 2 < run_time:
+        failures.append((offset, dets[len(failures) % len(dets)], length))
+        offset += length + 3 + rng.uniform(0, 2)
+    return failures
+
+
+def run_config(backend, loop_sleep, adaptive_poll, run_time, page_period, alarm_time):
+    """
+    Run watcher against a simulated monitor page for one configuration
+    :return: (chime latencies, alarm latencies past alarm time, failures, watcher's own latency summary)
+    """
+
+    dets = ['tof', 'btow', 'trigger', 'tpx']
+    failures = failure_script(dets, run_time, alarm_time)
+    monitor = SimulatedMonitor(dets, failures, page_period).start()
+
+    watcher = DaqWatcher(gui=QuietLog(), start_audio=False)
+    watcher.browserless = backend == 'http'
+    watcher.refresh_sleep = loop_sleep
+    watcher.adaptive_poll = adaptive_poll
+    watcher.min_run_time = 0
+    watcher.take_trigger_screenshots = 0
+    watcher.record_dead_times = 0
+    watcher.record_frames = 0
+    watcher.daq_url = monitor.url
+    for det in dets:
+        watcher.alarm_times[det] = alarm_time
+    sounds = SoundLog(time, {id(watcher.chimes): 'chimes', id(watcher.notify): 'notify',
+                             id(watcher.failure): 'failure', id(watcher.run_finished): 'run_finished'})
+    watcher.play_sound = sounds.play
+    watcher.loop_sound = sounds.loop
+
+    watcher.start()
+    sleep(run_time)
+    watcher.stop(True)
+    monitor.stop()
+
+    chimes, alarms = [], []
+    for index, onset in monitor.onsets.items():
+        offset, det, length = failures[index]
+        end = monitor.start_time + offset + length + page_period
+        chime = [t for t, name in sounds.starts if name == 'chimes' and onset <= t <= end]
+        alarm = [t for t, name in sounds.starts if name == 'notify' and onset <= t <= end]
+        if chime:
+            chimes.append(chime[0] - onset)
+        if alarm:
+            alarms.append(alarm[0] - onset - alarm_time)
+    return chimes, alarms, len(monitor.onsets), watcher.alarm_latency.summary()
+
+
+def format_latencies(values):
+    if len(values) == 0:
+        return f'{"-":>8}{"-":>8}{"-":>8}'
+    p50, p95, p99, max_time = (x * 1000 for x in percentiles(values))
+    return f'{p50:>8.0f}{p95:>8.0f}{max_time:>8.0f}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark time from dead detector on page to chime/alarm')
+    parser.add_argument('--backends', nargs='+', default=['http', 'selenium'], choices=['http', 'selenium'])
+    parser.add_argument('--loop-sleeps', nargs='+', type=float, default=[0.25, 1.0], help='loop_sleep values, s')
+    parser.add_argument('--schedulers', nargs='+', default=['fixed', 'adaptive'], choices=['fixed', 'adaptive'])
+    parser.add_argument('--run-time', type=float, default=60, help='s Simulated run length per configuration')
+    parser.add_argument('--page-period', type=float, default=2.0, help='s Time between simulated page updates')
+    parser.add_argument('--alarm-time', type=float, default=3.0, help='s Alarm time of simulated detectors')
+    parser.add_argument('--verbose', action='store_true', help='Also print watcher\'s own latency estimates')
+    args = parser.parse_args()
+
+    print(f'{"backend":<10}{"loop_sleep":>11}{"scheduler":>10}{"deaths":>7} | {"chime ms p50/p95/max":>24} | '
+          f'{"alarm past alarm time ms":>24}')
+    for backend, loop_sleep, scheduler in product(args.backends, args.loop_sleeps, args.schedulers):
+        chimes, alarms, deaths, estimates = run_config(backend, loop_sleep, scheduler == 'adaptive', args.run_time,
+                                                       args.page_period, args.alarm_time)
+        print(f'{backend:<10}{loop_sleep:>11.2f}{scheduler:>10}{deaths:>7} | {format_latencies(chimes):>24} | '
+              f'{format_latencies(alarms):>24}')
+        if args.verbose:
+            print(estimates)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 8:05 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/AudioDispatcher.py
+
+@author: Dylan Neff, Dylan
+"""
+
+from time import perf_counter
+from queue import SimpleQueue, Empty
+from collections import deque
+
+import numpy as np
+
+from DaqMetrics import percentiles
+
+
+class AudioDispatcher:
+    """
+    Play all sounds through one open output stream. play and loop just queue the sound and return. The stream callback
+    is the one audio worker: it picks up queued sounds and mixes everything playing in software, ducking sounds below
+    the highest priority playing. Counts underruns and time from request to sound reaching the output.
+    """
+
+    def __init__(self, frame_rate=44100, channels=2, block_size=512, duck_gain=0.25, print_status=print):
+        """
+        :param frame_rate: Hz Output stream sample rate, sounds at other rates are resampled once on first play
+        :param channels: Output stream channels
+        :param block_size: Frames mixed per callback
+        :param duck_gain: Gain of sounds below the highest priority playing
+        :param print_status: Function to report with
+        """
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.block_size = block_size
+        self.duck_gain = duck_gain
+        self.print_status = print_status
+        self.stream = None
+        self.requests = SimpleQueue()  # Voices waiting to be picked up by callback
+        self.voices = []  # Voices playing, only touched by callback
+        self.samples = {}  # id(clip) -> (clip, frames x channels sample array, scale to float) ready to mix
+        self.underruns = 0
+        self.blocks = 0
+        self.latencies = deque(maxlen=1000)  # s Request to output of recent sounds
+
+    def start(self):
+        """
+        Open output stream
+        :return: True if stream open, else False
+        """
+        try:
+            import sounddevice  # Loads PortAudio, which may be missing
+            self.stream = sounddevice.OutputStream(samplerate=self.frame_rate, channels=self.channels, dtype='float32',
+                                                   blocksize=self.block_size, latency='low', callback=self.callback)
+            self.stream.start()
+        except Exception as e:  # No PortAudio or no output device
+            self.print_status(f'Couldn\'t open audio output stream, playing sounds separately.\n{e}')
+            self.stream = None
+            return False
+        return True
+
+    def stop(self):
+        """
+        Close output stream. Call on exit, nothing plays after this.
+        :return:
+        """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def play(self, clip):
+        """
+        Queue clip to play once
+        :param clip: PcmClip or AudioSegment
+        :return: Voice with is_playing and stop, like a simpleaudio PlayObject
+        """
+        return self.request(clip, False)
+
+    def loop(self, clip):
+        """
+        Queue clip to play over and over until stopped
+        :param clip: PcmClip or AudioSegment
+        :return: Voice with is_playing and stop
+        """
+        return self.request(clip, True)
+
+    def request(self, clip, loop):
+        if id(clip) not in self.samples:
+            self.samples[id(clip)] = (clip,) + clip_samples(clip, self.frame_rate, self.channels)
+        samples, scale = self.samples[id(clip)][1:]
+        voice = Voice(samples, scale, loop, getattr(clip, 'priority', 0), perf_counter())
+        self.requests.put(voice)
+        return voice
+
+    def callback(self, outdata, frames, time_info, status):
+        """
+        Mix next block of all playing voices into outdata. Called by the stream on its own thread.
+        """
+        self.blocks += 1
+        if status.output_underflow:
+            self.underruns += 1
+        while True:
+            try:
+                self.voices.append(self.requests.get_nowait())
+            except Empty:
+                break
+        self.voices = [voice for voice in self.voices if not voice.done]
+        outdata.fill(0)
+        if len(self.voices) == 0:
+            return
+        output_delay = max(time_info.outputBufferDacTime - time_info.currentTime, 0)
+        top_priority = max(voice.priority for voice in self.voices)
+        for voice in self.voices:
+            if not voice.started:
+                voice.started = True
+                self.latencies.append(perf_counter() - voice.request_time + output_delay)
+            voice.mix_into(outdata, frames, 1.0 if voice.priority == top_priority else self.duck_gain)
+        np.clip(outdata, -1, 1, out=outdata)
+
+    def summary(self):
+        if len(self.latencies) == 0:
+            return f'Audio: {self.underruns} underruns in {self.blocks} blocks, no sounds played yet.'
+        p50, p95, p99, max_time = (x * 1000 for x in percentiles(self.latencies))
+        return f'Audio: {self.underruns} underruns in {self.blocks} blocks. Request to output latency over last ' \
+               f'{len(self.latencies)} sounds p50 {p50:.1f}ms, p95 {p95:.1f}ms, max {max_time:.1f}ms.'
+
+
+class Voice:
+    """
+    One sound playing through an AudioDispatcher. Same is_playing/stop interface as a simpleaudio PlayObject.
+    """
+
+    def __init__(self, samples, scale, loop, priority, request_time):
+        self.samples = samples  # frames x channels
+        self.scale = scale  # Factor from sample values to -1 to 1 floats
+        self.loop = loop
+        self.priority = priority
+        self.request_time = request_time
+        self.position = 0  # Next frame to play
+        self.started = False
+        self.done = False  # Set once finished or stopped, callback then drops voice
+
+    def is_playing(self):
+        return not self.done
+
+    def stop(self):
+        self.done = True
+
+    def mix_into(self, outdata, frames, gain):
+        """
+        Add next frames of voice to outdata
+        :param outdata: frames x channels float32 output block
+        :param frames: Number of frames to add
+        :param gain: Gain to add voice with
+        :return:
+        """
+        written = 0
+        while written < frames and not self.done:
+            num = min(frames - written, len(self.samples) - self.position)
+            chunk = self.samples[self.position:self.position + num]
+            outdata[written:written + num] += chunk.astype(np.float32) * np.float32(gain * self.scale)
+            written += num
+            self.position += num
+            if self.position >= len(self.samples):
+                if self.loop:
+                    self.position = 0
+                else:
+                    self.done = True
+
+
+def clip_samples(clip, frame_rate, channels):
+    """
+    Clip samples as an array ready to mix. Viewed in place (no copy) if clip already matches the output format.
+    :param clip: PcmClip or AudioSegment
+    :param frame_rate: Hz Output sample rate
+    :param channels: Output channels
+    :return: (frames x channels sample array, scale from sample values to -1 to 1 floats)
+    """
+
+    dtypes = {2: (np.int16, 1 / 2 ** 15), 4: (np.int32, 1 / 2 ** 31)}
+    if clip.sample_width not in dtypes:
+        raise ValueError(f'Can\'t mix {clip.sample_width * 8} bit audio')
+    dtype, scale = dtypes[clip.sample_width]
+    samples = np.frombuffer(clip.raw_data, dtype=dtype).reshape(-1, clip.channels)
+    if clip.channels == channels and clip.frame_rate == frame_rate:
+        return samples, scale
+
+    samples = samples.astype(np.float32) * np.float32(scale)
+    if clip.channels != channels:
+        samples = np.repeat(samples.mean(axis=1, keepdims=True), channels, axis=1)
+    if clip.frame_rate != frame_rate:
+        times = np.arange(round(len(samples) * frame_rate / clip.frame_rate)) * clip.frame_rate / frame_rate
+        samples = np.stack([np.interp(times, np.arange(len(samples)), samples[:, channel])
+                            for channel in range(channels)], axis=1).astype(np.float32)
+    return samples, 1.0
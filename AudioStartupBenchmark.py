@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 7:25 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/AudioStartupBenchmark.py
+
+Compare time to get the watcher's sounds ready in a fresh process: decoding with pydub, building the PCM cache (cold)
+and memory mapping an existing cache (warm). Each run is a new process so nothing is reused between runs.
+
+Usage: python AudioStartupBenchmark.py [--runs 10]
+
+@author: Dylan Neff, Dylan
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import subprocess
+import tempfile
+from time import perf_counter
+from statistics import median
+
+
+sound_paths = ['audio_files/chimes.wav', 'audio_files/notify.wav', 'audio_files/chord.wav', 'audio_files/Alarm04.wav']
+
+
+def load_child(mode, cache_dir):
+    """
+    Load sounds one way and print ms taken, including imports. Runs in the child process.
+    :param mode: 'decode' for pydub, 'cache' for load_sound
+    :param cache_dir: Directory of cache files
+    :return:
+    """
+
+    start = perf_counter()
+    if mode == 'decode':
+        from pydub import AudioSegment
+        sounds = [AudioSegment.from_file(path) for path in sound_paths]
+    else:
+        from DaqAudio import load_sound
+        sounds = [load_sound(path, cache_dir) for path in sound_paths]
+    print(f'{(perf_counter() - start) * 1000:.3f} {sum(len(sound.raw_data) for sound in sounds)}')
+
+
+def time_load(mode, cache_dir):
+    """
+    :return: (ms to load in a fresh process, bytes of PCM loaded)
+    """
+
+    result = subprocess.run([sys.executable, __file__, '--child', mode, cache_dir], capture_output=True, text=True,
+                            check=True)
+    load_ms, num_bytes = result.stdout.split()
+    return float(load_ms), int(num_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sound loading at startup')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh processes per case')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        load_child(*args.child)
+        return
+
+    cache_dir = tempfile.mkdtemp(prefix='daq_audio_cache_')
+    try:
+        times = {'pydub decode': [], 'cache cold (build)': [], 'cache warm (mmap)': []}
+        num_bytes = 0
+        for run in range(args.runs):
+            times['pydub decode'].append(time_load('decode', cache_dir)[0])
+            shutil.rmtree(cache_dir)
+            os.makedirs(cache_dir)
+            times['cache cold (build)'].append(time_load('cache', cache_dir)[0])
+            load_ms, num_bytes = time_load('cache', cache_dir)
+            times['cache warm (mmap)'].append(load_ms)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f'Loading {len(sound_paths)} sounds, {num_bytes / 1e6:.1f} MB of PCM, {args.runs} fresh processes each '
+          f'(ms, including imports)')
+    for case, case_times in times.items():
+        print(f'{case:<20} median {median(case_times):>8.1f}   min {min(case_times):>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
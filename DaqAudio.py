@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 6:50 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqAudio.py
+
+@author: Dylan Neff, Dylan
+"""
+
+import os
+import mmap
+import struct
+from threading import Thread, Event, Lock
+
+
+PCM_MAGIC = b'DAQPCM1\x00'
+PCM_HEADER = struct.Struct('<8sHHIqq')  # magic, channels, sample width, frame rate, source size, source mtime ns
+
+# Watcher sound name -> source file. Names are also how fan-out clients are told which sound to play.
+SOUND_FILES = {
+    'chimes': 'audio_files/chimes.wav',
+    'notify': 'audio_files/notify.wav',  # Alarm, looped until stopped
+    'failure': 'audio_files/chord.wav',
+    'run_finished': 'audio_files/Alarm04.wav',
+}
+SOUND_PRIORITIES = {'notify': 2, 'run_finished': 1, 'chimes': 1}  # Alarm ducks the rest
+
+
+class PcmClip:
+    """
+    Decoded sound as raw PCM. Has the raw_data, channels, sample_width and frame_rate of an AudioSegment, so it plays
+    through the same calls. raw_data can point straight into a memory mapped cache file.
+    """
+
+    def __init__(self, raw_data, channels, sample_width, frame_rate, priority=0):
+        self.raw_data = raw_data
+        self.channels = channels
+        self.sample_width = sample_width
+        self.frame_rate = frame_rate
+        self.priority = priority  # AudioDispatcher ducks sounds below the highest priority playing
+
+    def __len__(self):
+        """
+        :return: ms Length of clip, like len of an AudioSegment
+        """
+        return round(len(self.raw_data) / (self.channels * self.sample_width * self.frame_rate) * 1000)
+
+
+class LoopedPlayback:
+    """
+    Play one decoded clip over and over until stopped, replaying the same buffer each time instead of holding a long
+    pre-repeated copy. Same is_playing/stop interface as a simpleaudio PlayObject.
+    """
+
+    def __init__(self, segment, play=None):
+        """
+        Start looping straight away
+        :param segment: AudioSegment to loop
+        :param play: Function that starts playing a segment and returns a PlayObject, play_clip if None
+        """
+        self.segment = segment
+        self.play = play_clip if play is None else play
+        self.play_obj = None  # PlayObject of clip currently playing
+        self.stop_event = Event()
+        self.lock = Lock()  # Don't let stop slip in between checking for stop and starting next clip
+        self.thread = Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def loop(self):
+        while True:
+            with self.lock:
+                if self.stop_event.is_set():
+                    return
+                self.play_obj = self.play(self.segment)
+            self.play_obj.wait_done()
+
+    def is_playing(self):
+        return not self.stop_event.is_set() and self.thread.is_alive()
+
+    def stop(self):
+        with self.lock:
+            self.stop_event.set()
+            if self.play_obj is not None:
+                self.play_obj.stop()
+
+
+def play_clip(clip):
+    """
+    Start playing clip without waiting for it to finish. Same as pydub's _play_with_simpleaudio without importing pydub.
+    :param clip: PcmClip or AudioSegment
+    :return: simpleaudio PlayObject
+    """
+
+    import simpleaudio  # Only needed once something plays, same as pydub does it
+    return simpleaudio.play_buffer(clip.raw_data, num_channels=clip.channels, bytes_per_sample=clip.sample_width,
+                                   sample_rate=clip.frame_rate)
+
+
+def load_sound(path, cache_dir):
+    """
+    Load sound from cache of decoded PCM, memory mapped so nothing is decoded or copied. Build cache entry first if
+    missing or if source file changed since it was built.
+    :param path: Path to source sound file
+    :param cache_dir: Directory of cache files
+    :return: PcmClip
+    """
+
+    cache_path = os.path.join(cache_dir, f'{os.path.basename(path)}.pcm')
+    stat = os.stat(path)
+    clip = map_cached_sound(cache_path, stat)
+    if clip is None:
+        from pydub import AudioSegment  # Importing pydub takes longer than mapping every cached sound, only on miss
+        segment = AudioSegment.from_file(path)
+        try:
+            write_cached_sound(cache_path, segment, stat)
+            clip = map_cached_sound(cache_path, stat)
+        except OSError:
+            pass  # Cache not writable, just use decoded sound this time
+        if clip is None:
+            clip = PcmClip(segment.raw_data, segment.channels, segment.sample_width, segment.frame_rate)
+    return clip
+
+
+def load_sounds(cache_dir):
+    """
+    Load all watcher sounds with load_sound and give them their playback priorities
+    :param cache_dir: Directory of cache files
+    :return: Dictionary of sound name -> PcmClip
+    """
+
+    sounds = {name: load_sound(path, cache_dir) for name, path in SOUND_FILES.items()}
+    for name, priority in SOUND_PRIORITIES.items():
+        sounds[name].priority = priority
+    return sounds
+
+
+def map_cached_sound(cache_path, stat):
+    """
+    Memory map cache file if it was built from source file as it is now
+    :param cache_path: Path to cache file
+    :param stat: os.stat of source file
+    :return: PcmClip over mapped file, None if cache file missing or stale
+    """
+
+    try:
+        with open(cache_path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # ValueError if file empty
+        return None
+    if len(mapped) < PCM_HEADER.size:
+        mapped.close()
+        return None
+    magic, channels, sample_width, frame_rate, size, mtime_ns = PCM_HEADER.unpack_from(mapped)
+    if magic != PCM_MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+        mapped.close()
+        return None
+    return PcmClip(memoryview(mapped)[PCM_HEADER.size:], channels, sample_width, frame_rate)
+
+
+def write_cached_sound(cache_path, segment, stat):
+    """
+    Write decoded sound to cache file, stamped with source file size and modification time
+    :param cache_path: Path to cache file
+    :param segment: Decoded AudioSegment
+    :param stat: os.stat of source file
+    :return:
+    """
+
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with open(f'{cache_path}.tmp', 'wb') as file:
+        file.write(PCM_HEADER.pack(PCM_MAGIC, segment.channels, segment.sample_width, segment.frame_rate,
+                                   stat.st_size, stat.st_mtime_ns))
+        file.write(segment.raw_data)
+    os.replace(f'{cache_path}.tmp', cache_path)
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 10:15 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqFanout.py
+
+One watcher scrapes the DAQ Monitor and publishes to any number of shift stations over TCP, so the page is read once no
+matter how many stations watch it. Protocol is one JSON object per line, server to client only:
+    hello     Sent on connect: current state, dead detectors, last snapshot and looping sounds playing
+    status    Status line, as shown in the GUI
+    event     Watcher state change (see DaqWatcher.publish)
+    snapshot  DaqSnapshot of the last poll and whether a run is active
+    sound     Sound started, by name in DaqAudio.SOUND_FILES, with id and whether it loops
+    sound_stop  Sound with id stopped
+Every message has a 'sent' time. Thin clients (RemoteWatcher) play the sounds themselves, no browser needed.
+
+@author: Dylan Neff, Dylan
+"""
+
+import json
+import socket
+import asyncio
+from time import time, perf_counter
+from threading import Thread, Event, Lock
+from collections import deque
+
+from DaqAudio import LoopedPlayback, load_sounds, play_clip
+from DaqMetrics import StageTimer, percentiles
+
+
+DEFAULT_PORT = 8765
+
+
+class FanoutServer:
+    """
+    Publish one watcher's status lines, events, snapshots and sounds to thin clients. Runs on the watcher's engine loop.
+    Each message is encoded once and the same bytes are queued on every client's socket without waiting, so the watcher
+    never waits on a client. Clients that stop reading are dropped once max_buffer bytes back up.
+    """
+
+    def __init__(self, loop, port=DEFAULT_PORT, host='', print_status=print, max_buffer=2 ** 20):
+        """
+        :param loop: asyncio event loop to serve on, running in another thread
+        :param port: TCP port to listen on, 0 for any free port
+        :param host: Interface to listen on, all if ''
+        :param print_status: Function to log connections with
+        :param max_buffer: bytes Drop a client once this much is waiting to be sent to it
+        """
+        self.loop = loop
+        self.port = port
+        self.host = host
+        self.print_status = print_status
+        self.max_buffer = max_buffer
+        self.server = None
+        self.clients = set()  # StreamWriter of each connected client, only touched on loop
+        self.sound_names = {}  # id(clip) -> sound name, set in attach
+        self.next_sound_id = 0
+        self.id_lock = Lock()  # Sounds can start from the engine loop and the browser executor
+
+        # Latest state for clients that connect later, only touched on loop
+        self.state = {}  # Event -> last value, for state, silenced and chimes events
+        self.dead_dets = set()
+        self.last_snapshot = None  # Last snapshot message
+        self.loops = {}  # Sound id -> name of looping sounds still playing
+
+        self.send_times = deque(maxlen=1000)  # s Time to queue each message on every client
+        self.messages = 0
+        self.dropped = 0
+
+    def start(self):
+        """
+        Start listening. Call from any thread but the loop's.
+        :return: True if listening, else False
+        """
+        try:
+            self.server = asyncio.run_coroutine_threadsafe(
+                asyncio.start_server(self.handle_client, self.host or None, self.port), self.loop).result()
+        except OSError as e:
+            self.print_status(f'Couldn\'t start fan-out server on port {self.port}\n{e}')
+            return False
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.print_status(f'Serving thin clients on port {self.port}')
+        return True
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.close(), self.loop).result(timeout=5)
+
+    async def close(self):
+        self.server.close()
+        for writer in list(self.clients):
+            writer.close()
+        self.clients.clear()
+        await self.server.wait_closed()
+
+    def attach(self, watcher):
+        """
+        Learn watcher's sound names, so sounds can be published by name
+        :param watcher: DaqWatcher to publish
+        :return:
+        """
+        self.sound_names = {id(clip): name for name, clip in watcher.sounds.items()}
+
+    def status(self, status):
+        self.publish({'type': 'status', 'text': str(status)})
+
+    def event(self, event, value):
+        self.publish({'type': 'event', 'event': event, 'value': value})
+
+    def snapshot(self, snapshot, running):
+        self.publish({'type': 'snapshot', 'running': running, 'snapshot': snapshot})
+
+    def sound(self, clip, loop, playback):
+        """
+        Publish sound started by watcher
+        :param clip: PcmClip started
+        :param loop: True if looping until stopped
+        :param playback: Watcher's own playback of clip
+        :return: Playback that also publishes when it's stopped
+        """
+        with self.id_lock:
+            sound_id = self.next_sound_id
+            self.next_sound_id += 1
+        self.publish({'type': 'sound', 'id': sound_id, 'name': self.sound_names.get(id(clip)), 'loop': loop})
+        return FanoutPlayback(self, sound_id, playback)
+
+    def publish(self, message):
+        """
+        Encode message and hand it to the loop to send to every client. Safe from any thread.
+        :param message: Dictionary to send
+        :return:
+        """
+        message['sent'] = time()
+        data = json.dumps(message).encode() + b'\n'
+        self.loop.call_soon_threadsafe(self.send, message, data)
+
+    def send(self, message, data):
+        """
+        Remember message for clients that connect later and queue it on every client's socket. Runs on loop.
+        :param message: Dictionary sent
+        :param data: Encoded message
+        :return:
+        """
+        start = perf_counter()
+        self.remember(message)
+        for writer in list(self.clients):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.drop(writer)
+            else:
+                writer.write(data)
+        self.send_times.append(perf_counter() - start)
+        self.messages += 1
+
+    def remember(self, message):
+        if message['type'] == 'event':
+            if message['event'] == 'detector_dead':
+                self.dead_dets.add(message['value'])
+            elif message['event'] == 'detector_alive':
+                self.dead_dets.discard(message['value'])
+            else:
+                self.state[message['event']] = message['value']
+                if message['event'] == 'state' and message['value'] in ['starting', 'stopped']:
+                    self.dead_dets.clear()  # Dead times start over on start, same as GUI
+        elif message['type'] == 'snapshot':
+            self.last_snapshot = message
+        elif message['type'] == 'sound' and message['loop']:
+            self.loops[message['id']] = message['name']
+        elif message['type'] == 'sound_stop':
+            self.loops.pop(message['id'], None)
+
+    def drop(self, writer):
+        self.clients.discard(writer)
+        writer.transport.abort()  # Don't wait to flush what it didn't read
+        self.dropped += 1
+        self.print_status(f'Dropped thin client that stopped reading, {len(self.clients)} connected')
+
+    async def handle_client(self, reader, writer):
+        """
+        Send new client current state, then add it to clients until it hangs up. Clients don't send anything.
+        """
+        peer = writer.get_extra_info('peername')
+        hello = {'type': 'hello', 'sent': time(), 'state': self.state, 'dead_dets': sorted(self.dead_dets),
+                 'snapshot': self.last_snapshot, 'loops': self.loops}
+        writer.write(json.dumps(hello).encode() + b'\n')
+        self.clients.add(writer)
+        self.print_status(f'Thin client connected from {peer[0]}, {len(self.clients)} connected')
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            if writer in self.clients:
+                self.clients.discard(writer)
+                self.print_status(f'Thin client {peer[0]} disconnected, {len(self.clients)} connected')
+            writer.close()
+
+    def summary(self):
+        """
+        :return: String of clients, messages and time spent sending
+        """
+        if len(self.send_times) == 0:
+            return f'Fan-out: {len(self.clients)} clients, no messages sent'
+        p50, p95, p99, max_time = (x * 1e6 for x in percentiles(self.send_times))
+        return f'Fan-out: {len(self.clients)} clients, {self.messages} messages, {self.dropped} dropped clients. ' \
+               f'Send per message p50 {p50:.0f}us, p95 {p95:.0f}us, max {max_time:.0f}us'
+
+
+class FanoutPlayback:
+    """
+    Watcher's playback of a published sound. Publishes sound_stop when stopped so clients stop it too.
+    """
+
+    def __init__(self, server, sound_id, playback):
+        self.server = server
+        self.sound_id = sound_id
+        self.playback = playback
+
+    def is_playing(self):
+        return self.playback.is_playing()
+
+    def stop(self):
+        self.playback.stop()
+        self.server.publish({'type': 'sound_stop', 'id': self.sound_id})
+
+
+class RemoteWatcher:
+    """
+    Thin client of a FanoutServer, used by DaqWatchGUI in place of DaqWatcher. Shows the server's status lines and
+    detector states and plays its sounds locally. Start and stop connect and disconnect. Silence and chimes only apply
+    to this station.
+    """
+
+    def __init__(self, gui, server, retry_sleep=2.0, start_audio=True):
+        """
+        :param gui: DaqWatchGUI or anything else with print_status and watcher_event
+        :param server: 'host:port' of FanoutServer, port DEFAULT_PORT if left out
+        :param retry_sleep: s Wait between connection attempts
+        :param start_audio: If True open audio output stream now
+        """
+        self.gui = gui
+        host, _, port = server.partition(':')
+        self.address = (host, int(port) if port else DEFAULT_PORT)
+        self.retry_sleep = retry_sleep
+        self.timer = StageTimer()  # Records fanout_latency, time from server sending a message to it arriving here
+        self.screenshot_path = './Trigger_Screenshots/'  # Taken by server, none here
+
+        self.state = 'stopped'  # Connection state, published to GUI as the watcher's state
+        self.silent = False
+        self.dead_chime = True
+        self.keep_connected = False
+        self.stop_event = Event()
+        self.sock = None
+        self.thread = None
+        self.snapshot = None  # Last snapshot message from server
+        self.server_loops = {}  # Sound id -> name of looping sounds playing on server
+        self.playbacks = {}  # Sound id -> local playback
+
+        self.sounds = load_sounds('./audio_cache/')
+        self.play_sound = play_clip
+        self.loop_sound = LoopedPlayback
+        self.audio = None
+        if start_audio:
+            self.start_audio()
+
+    def start_audio(self):
+        from AudioDispatcher import AudioDispatcher
+        notify = self.sounds['notify']
+        audio = AudioDispatcher(notify.frame_rate, notify.channels, print_status=self.print_status)
+        if audio.start():
+            self.audio = audio
+            self.play_sound, self.loop_sound = audio.play, audio.loop
+
+    def start(self):
+        """
+        Connect to server in background, reconnecting whenever connection drops until stopped
+        :return:
+        """
+        self.keep_connected = True
+        self.stop_event.clear()
+        self.set_state('starting')
+        self.print_status(f'\nConnecting to watcher server {self.address[0]}:{self.address[1]}...')
+        self.thread = Thread(target=self.connect_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self, silent=False):
+        self.keep_connected = False
+        self.set_state('stopping')
+        self.stop_event.set()
+        sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+        self.stop_sounds()
+        self.set_state('stopped')
+        if not silent:
+            self.print_status('Disconnected')
+
+    def is_alive(self):
+        return self.keep_connected
+
+    def connect_loop(self):
+        reachable = True  # Only report the first failed attempt in a row
+        try:
+            while self.keep_connected:
+                connected = False
+                try:
+                    self.sock = socket.create_connection(self.address, timeout=self.retry_sleep)
+                    self.sock.settimeout(None)
+                    connected, reachable = True, True
+                    self.set_state('running')
+                    self.read_messages(self.sock.makefile('rb'))
+                except OSError as e:
+                    if self.keep_connected and reachable:
+                        self.print_status(f'Couldn\'t reach watcher server, retrying every {self.retry_sleep:.0f}s: '
+                                          f'{e}')
+                        reachable = False
+                finally:
+                    if self.sock is not None:
+                        self.sock.close()
+                        self.sock = None
+                if self.keep_connected:
+                    self.set_state('starting')
+                    if connected:
+                        self.lost_connection()
+                    self.stop_event.wait(self.retry_sleep)
+        finally:
+            if self.keep_connected:  # Thread died on something unexpected, don't leave station showing 'running'
+                self.keep_connected = False
+                self.set_state('stopped')
+                self.print_status('Connection to watcher server failed, no longer watching. Click Start to reconnect.')
+                self.lost_connection()
+
+    def lost_connection(self):
+        """
+        Stop server's sounds and play failure chord to let station know it isn't being watched for it
+        :return:
+        """
+        self.stop_sounds()
+        if not self.silent:
+            self.play_sound(self.sounds['failure'])
+
+    def read_messages(self, stream):
+        """
+        Handle messages from server until it hangs up or sends one that can't be read. A message cut off when the
+        server drops a slow client, or any garbled one, is handled as a disconnect so the connection starts over.
+        :param stream: Binary file of socket
+        :return:
+        """
+        for line in stream:
+            try:
+                message = json.loads(line)
+                self.timer.record('fanout_latency', time() - message['sent'])
+                self.handle(message)
+            except (ValueError, KeyError, TypeError) as e:  # Includes UnicodeDecodeError
+                if self.keep_connected:
+                    self.print_status(f'Bad message from watcher server, reconnecting: {e!r}')
+                return
+        if self.keep_connected:
+            self.print_status('Watcher server hung up')
+
+    def handle(self, message):
+        kind = message['type']
+        if kind == 'status':
+            self.print_status(message['text'])
+        elif kind == 'event':
+            if message['event'] in ['detector_dead', 'detector_alive']:
+                self.gui.watcher_event(message['event'], message['value'])
+            elif message['event'] == 'state':
+                self.print_status(f'Watcher server {message["value"]}')  # Own state is the connection
+        elif kind == 'snapshot':
+            self.snapshot = message
+        elif kind == 'sound':
+            if message['loop']:
+                self.server_loops[message['id']] = message['name']
+            self.play(message['id'], message['name'], message['loop'])
+        elif kind == 'sound_stop':
+            self.server_loops.pop(message['id'], None)
+            playback = self.playbacks.pop(message['id'], None)
+            if playback is not None:
+                playback.stop()
+        elif kind == 'hello':
+            self.snapshot = message['snapshot']
+            for det in message['dead_dets']:
+                self.gui.watcher_event('detector_dead', det)
+            self.server_loops = {int(sound_id): name for sound_id, name in message['loops'].items()}
+            for sound_id, name in self.server_loops.items():
+                self.play(sound_id, name, True)
+            self.print_status(f'Connected to watcher server, which is {message["state"].get("state", "stopped")}')
+
+    def play(self, sound_id, name, loop):
+        """
+        Play sound server started, unless silenced here
+        :param sound_id: Server's id of sound
+        :param name: Sound name
+        :param loop: True to loop until server stops it
+        :return:
+        """
+        if self.silent or name not in self.sounds or (name == 'chimes' and not self.dead_chime):
+            return
+        self.playbacks = {x: playback for x, playback in self.playbacks.items() if playback.is_playing()}
+        clip = self.sounds[name]
+        self.playbacks[sound_id] = self.loop_sound(clip) if loop else self.play_sound(clip)
+
+    def stop_sounds(self):
+        for playback in self.playbacks.values():
+            playback.stop()
+        self.playbacks = {}
+
+    def silence(self):
+        self.stop_sounds()
+        self.silent = True
+        self.gui.watcher_event('silenced', True)
+        self.print_status('\nSilenced')
+
+    def unsilence(self):
+        self.silent = False
+        self.gui.watcher_event('silenced', False)
+        self.print_status('\nUnsilenced')
+        for sound_id, name in list(self.server_loops.items()):  # Alarm still going on server
+            self.play(sound_id, name, True)
+
+    def set_dead_chime(self, dead_chime):
+        self.dead_chime = dead_chime
+        self.gui.watcher_event('chimes', dead_chime)
+
+    def set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.gui.watcher_event('state', state)  # GUI clears dead detectors on starting and stopped, hello resends
+
+    def print_status(self, status):
+        self.gui.print_status(status)
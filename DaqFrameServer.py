@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 10:48 AM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqFrameServer.py
+
+@author: Dylan Neff, Dylan
+"""
+
+import os
+from threading import Thread, Lock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class FrameServer:
+    """
+    Local stand-in for the DAQ Monitor server. Serves recorded left, main and header frame documents under a frameset
+    index page laid out like the real one, so page sources can be run against it without the live STAR page.
+    """
+
+    frame_names = ['left', 'main', 'header']
+
+    def __init__(self, frames=None, host='127.0.0.1', port=0):
+        """
+        :param frames: Dictionary of frame name -> html document to serve
+        :param host: Host to serve on
+        :param port: Port to serve on, 0 picks a free one
+        """
+        self.frames = {}
+        self.lock = Lock()
+        self.requests_served = 0
+        if frames is not None:
+            self.set_frames(frames)
+        self.server = ThreadingHTTPServer((host, port), self.make_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def set_frames(self, frames):
+        """
+        Replace served frame documents, next requests get these
+        :param frames: Dictionary of frame name -> html document
+        :return:
+        """
+        with self.lock:
+            self.frames.update({name: html.encode('utf-8') if isinstance(html, str) else html
+                                for name, html in frames.items()})
+
+    def get_document(self, path):
+        """
+        Get served document for request path
+        :param path: Request path
+        :return: Document bytes, None if nothing served at path
+        """
+        name = path.split('?')[0].strip('/')
+        if name in ['', 'index.html']:
+            return index_html(self.frame_names).encode('utf-8')
+        with self.lock:
+            self.requests_served += 1
+            return self.frames.get(name.replace('.html', ''))
+
+    def start(self):
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def make_handler(self):
+        frame_server = self
+
+        class FrameHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep connections alive like the real server
+            disable_nagle_algorithm = True  # Headers and body go out in separate writes, don't hold the body back
+
+            def do_GET(self):
+                document = frame_server.get_document(self.path)
+                if document is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(document)))
+                self.end_headers()
+                self.wfile.write(document)
+
+            def log_message(self, format, *args):
+                pass  # Don't spam console with every request
+
+        return FrameHandler
+
+
+def index_html(frame_names):
+    """
+    Top level frameset page pointing at each served frame document
+    :param frame_names: Names of frames to include
+    :return: Html of index page
+    """
+
+    frames = '\n'.join(f'<frame id="{name}" name="{name}" src="{name}.html">' for name in frame_names)
+    return f'<html><frameset cols="20%,80%">\n{frames}\n</frameset></html>'
+
+
+def read_frames(directory):
+    """
+    Read recorded frame documents from directory holding left.html, main.html and header.html
+    :param directory: Path to directory of recorded frames
+    :return: Dictionary of frame name -> html document
+    """
+
+    frames = {}
+    for name in FrameServer.frame_names:
+        with open(os.path.join(directory, f'{name}.html'), 'rb') as file:
+            frames[name] = file.read()
+    return frames
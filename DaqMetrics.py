@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 12:25 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqMetrics.py
+
+@author: Dylan Neff, Dylan
+"""
+
+from time import time, perf_counter
+from datetime import datetime as dt
+from contextlib import contextmanager
+from collections import deque, Counter
+
+
+class PollGapTracker:
+    """
+    Track time between successful polls of the DAQ Monitor. Report the longest gap around each run boundary (run start
+    or stop), which is when browser restarts used to leave the watcher blind.
+    """
+
+    def __init__(self, window=60, print_status=print):
+        """
+        :param window: s Report longest gap among polls within this long before and after each run boundary
+        :param print_status: Function to report with
+        """
+        self.window = window
+        self.print_status = print_status
+        self.polls = deque()  # (time of poll, gap since previous poll) for recent polls
+        self.boundaries = deque()  # (time, name) of run boundaries not yet reported
+        self.last_poll_time = None
+        self.max_gap = 0  # s Longest gap seen since tracker made
+
+    def poll(self):
+        """
+        Mark a successful poll
+        :return:
+        """
+        now = time()
+        gap = 0 if self.last_poll_time is None else now - self.last_poll_time
+        self.last_poll_time = now
+        self.max_gap = max(self.max_gap, gap)
+        self.polls.append((now, gap))
+        self.report_boundaries(now)
+        while self.polls and self.polls[0][0] < now - 2 * self.window:
+            self.polls.popleft()  # No unreported boundary can need these anymore
+
+    def boundary(self, name):
+        """
+        Mark a run boundary, reported once window has passed
+        :param name: Name of boundary for report, eg 'run start'
+        :return:
+        """
+        self.boundaries.append((time(), name))
+
+    def report_boundaries(self, now):
+        while self.boundaries and now - self.boundaries[0][0] > self.window:
+            boundary_time, name = self.boundaries.popleft()
+            gaps = [gap for poll_time, gap in self.polls if abs(poll_time - boundary_time) <= self.window]
+            self.print_status(f'Longest gap between polls within {self.window:.0f}s of {name}: '
+                              f'{max(gaps, default=0):.2f}s')
+
+
+class HitCounter:
+    """
+    Count how often a cached result could be reused instead of doing the work again, or more generally how often
+    something happened
+    """
+
+    def __init__(self, name, hit_label='skipped'):
+        """
+        :param name: Name of counter for summary
+        :param hit_label: What a hit means, for hit rate in summary
+        """
+        self.name = name
+        self.hit_label = hit_label
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total > 0 else 0
+        return f'{self.name}: {self.hits} hits, {self.misses} misses ({rate:.0f}% {self.hit_label})'
+
+
+class CommandCounter:
+    """
+    Count commands sent to the page (WebDriver commands or HTTP requests) per poll cycle, so cost of a cycle can be
+    compared between page sources and versions.
+    """
+
+    def __init__(self):
+        self.current = Counter()  # Command name -> count in cycle in progress
+        self.last_cycle = Counter()  # Command name -> count in last finished cycle
+        self.total = 0  # Commands over all finished cycles
+        self.cycles = 0  # Number of finished cycles
+
+    def count(self, command):
+        self.current[command] += 1
+
+    def begin_cycle(self):
+        """
+        Finish the cycle in progress and start counting a new one
+        :return:
+        """
+        if sum(self.current.values()) > 0:
+            self.last_cycle = self.current
+            self.total += sum(self.current.values())
+            self.cycles += 1
+        self.current = Counter()
+
+    def average(self):
+        return self.total / self.cycles if self.cycles > 0 else 0
+
+    def summary(self):
+        last = ', '.join(f'{command} {count}' for command, count in self.last_cycle.most_common())
+        return f'{self.average():.1f} commands per poll on average. Last poll: {sum(self.last_cycle.values())} ' \
+               f'({last})'
+
+    def wrap_driver(self, driver):
+        """
+        Count every command a selenium driver sends. All WebDriver and WebElement calls go through driver.execute.
+        :param driver: Selenium driver
+        :return:
+        """
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.count(driver_command)
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+
+
+class StageTimer:
+    """
+    Time stages of the watch loop into rolling windows of recent durations, summarized as percentiles on demand.
+    Recording is two perf_counter calls and a deque append, cheap enough to leave on all the time.
+    """
+
+    def __init__(self, window=1000):
+        """
+        :param window: Number of most recent durations per stage to keep for percentiles
+        """
+        self.window = window
+        self.samples = {}  # Stage name -> deque of recent durations in s
+        self.counts = Counter()  # Stage name -> times recorded since reset
+
+    def record(self, stage, duration):
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(duration)
+        self.counts[stage] += 1
+
+    @contextmanager
+    def time(self, stage):
+        """
+        Time body of with statement as stage
+        :param stage: Name of stage
+        :return:
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, perf_counter() - start)
+
+    def reset(self):
+        self.samples = {}
+        self.counts = Counter()
+
+    def percentiles(self, stage):
+        """
+        :param stage: Name of stage
+        :return: (p50, p95, p99, max) in s of stage durations in window
+        """
+        return percentiles(self.samples[stage])
+
+    def summary(self):
+        if len(self.samples) == 0:
+            return 'No stage timings yet.'
+        lines = [f'Stage timings over last {self.window} of each (ms)',
+                 f'{"stage":<16}{"count":>8}{"p50":>9}{"p95":>9}{"p99":>9}{"max":>9}']
+        for stage in list(self.samples):
+            p50, p95, p99, max_time = (x * 1000 for x in self.percentiles(stage))
+            lines.append(f'{stage:<16}{self.counts[stage]:>8}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{max_time:>9.2f}')
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        """
+        Append summary to file
+        :param path: Path of file to append to
+        :return:
+        """
+        with open(path, 'a') as file:
+            file.write(f'{dt.now().strftime("%Y-%m-%d %H:%M:%S")}\n{self.summary()}\n\n')
+
+
+class AlarmLatencyTracker:
+    """
+    Stamp each detector death on its way through the watcher: estimated page update that first showed it, poll that
+    read it, detection, and start of the chime and alarm playback. Latencies are measured from the page update, alarm
+    latency past the detector's alarm time.
+    """
+
+    def __init__(self, window=200):
+        """
+        :param window: Number of most recent detector deaths to keep for summary
+        """
+        self.episodes = {}  # Detector name -> stamps of death in progress
+        self.finished = deque(maxlen=window)  # Stamps of deaths detector has come back from
+        self.seen_time = None  # When last poll was read
+        self.update_time = None  # Estimated time of page update last poll showed
+
+    def poll(self, seen_time, update_time):
+        """
+        Mark a poll
+        :param seen_time: When poll result was read
+        :param update_time: Estimated time of page update poll result came from
+        :return:
+        """
+        self.seen_time, self.update_time = seen_time, update_time
+
+    def detected(self, det, alarm_time, now):
+        """
+        Mark detector found dead in last poll
+        :param det: Detector name
+        :param alarm_time: s Detector's alarm time
+        :param now: Time of detection
+        :return:
+        """
+        self.episodes[det] = {'update': self.update_time, 'seen': self.seen_time, 'detected': now,
+                              'alarm_time': alarm_time}
+
+    def played(self, sound, det, now):
+        """
+        Mark sound audible for detector. Only the first time for each death counts.
+        :param sound: 'chime' or 'alarm'
+        :param det: Detector name
+        :param now: Time sound started (or was found already playing)
+        :return:
+        """
+        episode = self.episodes.get(det)
+        if episode is not None and sound not in episode:
+            episode[sound] = now
+
+    def alive(self, det):
+        episode = self.episodes.pop(det, None)
+        if episode is not None:
+            self.finished.append(episode)
+
+    def latencies(self):
+        """
+        :return: Dictionary of latency name -> list of latencies in s over kept deaths
+        """
+        latencies = {'update to poll': [], 'poll to detection': [], 'update to chime': [], 'alarm past alarm time': []}
+        for episode in list(self.finished) + list(self.episodes.values()):
+            latencies['update to poll'].append(episode['seen'] - episode['update'])
+            latencies['poll to detection'].append(episode['detected'] - episode['seen'])
+            if 'chime' in episode:
+                latencies['update to chime'].append(episode['chime'] - episode['update'])
+            if 'alarm' in episode:
+                latencies['alarm past alarm time'].append(episode['alarm'] - episode['update'] - episode['alarm_time'])
+        return latencies
+
+    def summary(self):
+        latencies = self.latencies()
+        if len(latencies['update to poll']) == 0:
+            return 'No detector deaths seen yet.'
+        lines = [f'Alarm latency over last {len(latencies["update to poll"])} detector deaths (ms)',
+                 f'{"latency":<24}{"count":>7}{"p50":>9}{"p95":>9}{"p99":>9}{"max":>9}']
+        for name, values in latencies.items():
+            if len(values) > 0:
+                p50, p95, p99, max_time = (x * 1000 for x in percentiles(values))
+                lines.append(f'{name:<24}{len(values):>7}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{max_time:>9.1f}')
+        return '\n'.join(lines)
+
+
+def percentiles(values):
+    """
+    :param values: Collection of numbers
+    :return: (p50, p95, p99, max) of values, nearest rank
+    """
+
+    values = sorted(values)
+    last = len(values) - 1
+    return tuple(values[round(q * last)] for q in [0.5, 0.95, 0.99]) + (values[-1],)
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 10:05 AM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqPageSource.py
+
+@author: Dylan Neff, Dylan
+"""
+
+import os
+from sys import platform
+import logging
+import json
+from time import sleep, time
+from urllib.parse import urljoin
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from DaqSnapshot import SnapshotObserver, FRAMES_SCRIPT, RELOAD_SCRIPT, script_xpaths, build_snapshot
+from DaqMetrics import CommandCounter, HitCounter
+
+
+# selenium, webdriver_manager, requests and lxml are each slow to import, so they are imported where first used and only
+# the page source actually started pays for its own. Browserless runs don't need selenium installed at all.
+BY_XPATH = 'xpath'  # selenium By.XPATH, without importing selenium
+
+install_lock = Lock()  # webdriver_manager keeps one shared drivers.json, don't let parallel probes write it at once
+
+# Browser name -> (selenium options, selenium driver), in order to try them. Managers from driver_manager.
+driver_managers = {
+    'Firefox': ('FirefoxOptions', 'Firefox'),
+    'Chrome': ('ChromeOptions', 'Chrome'),
+    'Edge': ('EdgeOptions', 'Edge'),
+}
+
+
+class PageSource:
+    """
+    Where DaqWatcher gets DAQ Monitor page contents from. Subclasses open the page in start, pull fresh data from the
+    server in refresh and return a DaqSnapshot of the current state in read_snapshot.
+    """
+
+    name = 'None'
+
+    def __init__(self, url, xpaths, print_status=print):
+        self.url = url
+        self.xpaths = xpaths
+        self.print_status = print_status
+        self.driver = None  # Selenium driver if this source has one, else None
+        self.commands = CommandCounter()  # Commands sent to the page per poll cycle
+        self.changed_dets = None  # Lower case names of detectors that changed in last read_snapshot, None if all may
+        self.unchanged = False  # True if last read_snapshot found tables same as read before and reused last snapshot
+        self.unchanged_reads = HitCounter('Unchanged page reads')  # Hit if read_snapshot could skip building snapshot
+        self.reload_updates = HitCounter('Reloads seen updating page', 'updated')  # Hit if reload_wait saw an update
+
+    def start(self):
+        """
+        Open DAQ Monitor page
+        :return: True if page opened, else False
+        """
+        raise NotImplementedError
+
+    def stop(self):
+        """
+        Close DAQ Monitor page and release anything held open
+        :return:
+        """
+        raise NotImplementedError
+
+    def refresh(self, num_refresh=1, refresh_pause=0.2):
+        """
+        Get fresh data from the DAQ Monitor server
+        :param num_refresh: Number of times to refresh
+        :param refresh_pause: Length of time to pause after each refresh (seconds)
+        :return:
+        """
+        raise NotImplementedError
+
+    def reload_wait(self, timeout):
+        """
+        Refresh once and return once the reloaded data can be read, so a read straight after sees it
+        :param timeout: s Longest to wait for page to update
+        :return:
+        """
+        self.refresh(refresh_pause=0)  # Fetching sources have the new data once refresh returns
+
+    def read_snapshot(self):
+        """
+        Read current DAQ Monitor state
+        :return: DaqSnapshot of page state
+        """
+        raise NotImplementedError
+
+    def capture_frames(self):
+        """
+        Get the current left, main and header frame documents, for recording and replaying later
+        :return: Dictionary of frame name -> html document, None for frames that couldn't be read
+        """
+        raise NotImplementedError
+
+    def begin_cycle(self):
+        """
+        Mark start of a new poll cycle for command counting
+        :return:
+        """
+        self.commands.begin_cycle()
+
+    def invalidate(self):
+        """
+        Forget anything cached about page layout, eg after someone else navigated the page
+        :return:
+        """
+        pass
+
+
+class SeleniumPageSource(PageSource):
+    """
+    Run DAQ Monitor page in a headless browser and read it through a selenium webdriver.
+    """
+
+    name = 'Browser'
+
+    def __init__(self, url, xpaths, print_status=print, driver_cache_path='driver_cache.json'):
+        super().__init__(url, xpaths, print_status)
+        self.driver_cache_path = driver_cache_path  # Remembers last browser/driver pair that worked
+        self.frames = None  # FrameReader for driver, set in start
+        self.observer = SnapshotObserver(xpaths)  # Reads only table rows that changed since last read
+
+    def get_driver_paths(self, browser_names=None):
+        """
+        Download drivers with webdriver_manager and save paths along with driver options. Browsers whose drivers can't
+        be resolved (eg offline and never downloaded) are left out.
+        :param browser_names: Browsers to resolve drivers for, all in driver_managers if None
+        :return:
+        """
+        # Attempts to suppress popup log window and geckodriver.log file, none successful.
+        os.environ['WDM_LOG'] = str(logging.NOTSET)  # Turn off webdriver_manager logs
+        os.environ['WDM_LOG_LEVEL'] = '0'  # Turn off webdriver_manager logs
+        os.environ['WDM_PROGRESS_BAR'] = str(0)  # Turn off webdriver_manager download progress bar
+
+        if browser_names is None:
+            browser_names = list(driver_managers)
+        self.print_status(f'Downloading browser drivers for {", ".join(browser_names)}...')
+        driver_paths = {}
+        for browser_name in browser_names:
+            options, driver = driver_managers[browser_name]
+            try:
+                with install_lock:
+                    driver_path = driver_manager(browser_name)().install()
+                driver_paths[browser_name] = {'driver_path': driver_path, 'options': options, 'driver': driver}
+            except Exception as e:  # webdriver_manager raises all sorts of errors when offline
+                self.print_status(f'Couldn\'t download {browser_name} driver: {e}')
+
+        return driver_paths
+
+    def start_driver(self, driver_paths):
+        """
+        Get selenium driver in headless and silent mode. Try drivers in order given and take the first one that works.
+        Remember the one that worked in driver cache for next start.
+        :param driver_paths: Dictionary of driver paths and corresponding methods for selenium
+        :return:
+        """
+        from selenium.common.exceptions import WebDriverException
+        for browser_name, driver in driver_paths.items():
+            try:
+                self.driver = launch_driver(browser_name, driver)
+                self.print_status(f'Starting with {browser_name}')
+                write_driver_cache(self.driver_cache_path, browser_name, driver)
+                return  # Take the first good driver and run with it.
+            except WebDriverException:
+                self.print_status(f'Couldn\'t find {browser_name} binaries (probably), trying another browser.')
+
+    def probe_drivers(self, browser_names):
+        """
+        Resolve and launch all candidate browsers in parallel. Take the first healthy one and quit the rest as they
+        finish starting, so a missing browser doesn't hold up the others. Winner is remembered in driver cache.
+        :param browser_names: Browsers to try
+        :return:
+        """
+        executor = ThreadPoolExecutor(max_workers=len(browser_names))
+        futures = [executor.submit(self.probe_driver, browser_name) for browser_name in browser_names]
+        winner = None
+        for future in as_completed(futures):
+            if future.exception() is None and future.result() is not None:
+                winner = future
+                break
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(quit_probe)  # Runs now if already done, else once that browser is up
+        executor.shutdown(wait=False)
+
+        if winner is not None:
+            browser_name, driver, self.driver = winner.result()
+            self.print_status(f'Starting with {browser_name}')
+            write_driver_cache(self.driver_cache_path, browser_name, driver)
+
+    def probe_driver(self, browser_name):
+        """
+        Resolve driver for one browser, launch it and check the session responds.
+        :param browser_name: Browser to try
+        :return: (browser_name, driver entry, selenium driver) if healthy, else None
+        """
+        from selenium.common.exceptions import WebDriverException
+        driver = self.get_driver_paths([browser_name]).get(browser_name)
+        if driver is None:
+            return None
+        try:
+            selenium_driver = launch_driver(browser_name, driver)
+        except WebDriverException:
+            self.print_status(f'Couldn\'t find {browser_name} binaries (probably).')
+            return None
+        try:
+            selenium_driver.execute_script('return 1;')
+        except WebDriverException:
+            self.print_status(f'{browser_name} started but isn\'t responding, dropping it.')
+            quit_driver(selenium_driver)
+            return None
+        return browser_name, driver, selenium_driver
+
+    def start(self):
+        """
+        Start browser with cached driver if there is one, only resolving drivers (network) if that fails. Then probe
+        all browsers in parallel and take the first that works.
+        :return:
+        """
+        start_time = time()
+        cached = read_driver_cache(self.driver_cache_path)
+        if cached is not None:
+            self.start_driver(cached)
+        if self.driver is not None:
+            self.print_status(f'Browser started in {time() - start_time:.1f}s with cached driver')
+        else:
+            self.probe_drivers(list(driver_managers))
+            if self.driver is None:
+                self.print_status(f'Couldn\'t find any drivers that work, giving up.\n')
+                return False
+            self.print_status(f'Browser started in {time() - start_time:.1f}s after resolving drivers')
+        self.commands.wrap_driver(self.driver)
+        self.frames = FrameReader(self.driver, self.xpaths['frames'])
+        self.driver.get(self.url)
+        sleep(0.1)  # Give some time for page to load. Doesn't seem like this is needed but keep to avoid any annoyances
+        return True
+
+    def stop(self):
+        from selenium.common.exceptions import WebDriverException
+        if self.driver is not None:
+            try:
+                self.driver.close()
+                self.driver.quit()
+            except WebDriverException as e:
+                self.print_status(f'Looks like closing the webdriver somehow failed?')
+                self.print_status(e)
+                quit_driver(self.driver)  # Make sure browser process doesn't outlive us
+            self.driver = None
+            self.frames = None
+
+    def refresh(self, num_refresh=1, refresh_pause=0.2):
+        self.frames.click('left', self.xpaths['buttons']['refresh'], num_refresh, refresh_pause)
+
+    def reload_wait(self, timeout):
+        # Reload click lands straight away but the frames update after, clicking and waiting in the page saves reading
+        # the pre-reload tables and only picking up new data a whole poll later
+        result = self.driver.execute_async_script(RELOAD_SCRIPT, script_xpaths(self.xpaths), timeout * 1000)
+        self.reload_updates.count(result['updated'])
+
+    def read_snapshot(self):
+        snapshot = self.observer.read(self.driver)  # Reads all frames from whichever one driver is in
+        self.changed_dets = self.observer.changed_dets
+        self.unchanged = self.observer.unchanged
+        self.unchanged_reads.count(self.unchanged)
+        return snapshot
+
+    def capture_frames(self):
+        return self.driver.execute_script(FRAMES_SCRIPT, script_xpaths(self.xpaths))
+
+    def invalidate(self):
+        if self.frames is not None:
+            self.frames.invalidate()
+        self.observer.reset()
+
+
+class FrameReader:
+    """
+    Frame-scoped access to a selenium driver. Remembers which frame the driver is in so each frame is switched to at
+    most once per cycle, and caches frame and element handles until they go stale.
+    """
+
+    def __init__(self, driver, frame_xpaths):
+        """
+        :param driver: Selenium driver
+        :param frame_xpaths: Dictionary of frame name -> xpath of frame
+        """
+        self.driver = driver
+        self.frame_xpaths = frame_xpaths
+        self.current_frame = None  # Name of frame driver is in, None if unknown
+        self.frame_elements = {}  # Frame name -> frame element handle
+        self.elements = {}  # (frame name, xpath) -> element handle
+
+    def switch(self, frame_name):
+        """
+        Switch driver to frame, unless already there
+        :param frame_name: Name of frame to switch to
+        :return:
+        """
+        if self.current_frame == frame_name:
+            return
+        from selenium.common.exceptions import StaleElementReferenceException, NoSuchFrameException
+        self.current_frame = None  # Unknown until switch succeeds
+        self.driver.switch_to.default_content()
+        try:
+            self.driver.switch_to.frame(self.frame_element(frame_name))
+        except (StaleElementReferenceException, NoSuchFrameException):
+            self.frame_elements.pop(frame_name, None)  # Frameset reloaded, find frame again
+            self.driver.switch_to.frame(self.frame_element(frame_name))
+        self.current_frame = frame_name
+
+    def frame_element(self, frame_name):
+        if frame_name not in self.frame_elements:
+            self.frame_elements[frame_name] = self.driver.find_element(BY_XPATH, self.frame_xpaths[frame_name])
+        return self.frame_elements[frame_name]
+
+    def find(self, frame_name, xpath):
+        """
+        Find element in frame, reusing handle from an earlier find if there is one
+        :param frame_name: Name of frame element is in
+        :param xpath: xpath of element
+        :return: Element handle
+        """
+        self.switch(frame_name)
+        if (frame_name, xpath) not in self.elements:
+            self.elements[(frame_name, xpath)] = self.driver.find_element(BY_XPATH, xpath)
+        return self.elements[(frame_name, xpath)]
+
+    def click(self, frame_name, xpath, num_click=1, click_pause=0.2):
+        """
+        Click element num_click times with click_pause wait in between. Find element again if handle went stale.
+        :param frame_name: Name of frame element is in
+        :param xpath: xpath of element
+        :param num_click: Number of times to click
+        :param click_pause: Length of time to pause after each click (seconds)
+        :return:
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+        for i in range(num_click):
+            try:
+                self.find(frame_name, xpath).click()
+            except StaleElementReferenceException:
+                self.invalidate()  # Frame document reloaded, all handles in it are gone
+                self.find(frame_name, xpath).click()
+            sleep(click_pause)
+
+    def invalidate(self):
+        """
+        Forget current frame and all cached handles
+        :return:
+        """
+        self.current_frame = None
+        self.frame_elements = {}
+        self.elements = {}
+
+
+class HttpPageSource(PageSource):
+    """
+    Fetch DAQ Monitor frame documents directly over a pooled keep-alive HTTP session and parse them with the same
+    xpaths the browser uses. No browser needed.
+    """
+
+    name = 'HTTP'
+
+    def __init__(self, url, xpaths, print_status=print, timeout=5):
+        super().__init__(url, xpaths, print_status)
+        self.timeout = timeout  # s How long to wait for server before giving up on a request
+        self.session = None
+        self.frame_urls = {}  # Frame name -> url of the frame document
+        self.frame_trees = {}  # Frame name -> most recently fetched and parsed frame document
+        self.frame_documents = {}  # Frame name -> most recently fetched frame document as received
+        self.frame_hashes = {}  # Frame name -> hash of frame_documents, only documents that changed are parsed again
+        self.changed_frames = set()  # Frames whose content changed since last read_snapshot
+        self.raw = {}  # Snapshot fields last read from each frame's tree, as build_snapshot takes them
+        self.snapshot = None  # Last snapshot built, returned again while no frame changes
+        self.frame_names = ['left', 'main', 'header']
+
+    def start(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(self.frame_names))  # All frames on the same host
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        try:
+            top = self.fetch(self.url)
+            for frame_name in self.frame_names:
+                frames = top.xpath(self.xpaths['frames'][frame_name])
+                if len(frames) == 0 or frames[0].get('src') is None:
+                    self.print_status(f'Couldn\'t find {frame_name} frame on DAQ Monitor page, giving up.\n')
+                    self.stop()
+                    return False
+                self.frame_urls[frame_name] = urljoin(self.url, frames[0].get('src'))
+        except requests.RequestException as e:
+            self.print_status(f'Couldn\'t load DAQ Monitor page, giving up.\n{e}')
+            self.stop()
+            return False
+        self.print_status(f'Starting with {self.name} page source')
+        return True
+
+    def stop(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        self.frame_trees = {}
+        self.frame_documents = {}
+        self.invalidate()
+
+    def refresh(self, num_refresh=1, refresh_pause=0.2):
+        import lxml.html
+
+        # Each fetch gets the server's current state, so unlike the browser one refresh is always enough.
+        for frame_name, frame_url in self.frame_urls.items():
+            document = self.fetch_document(frame_url)
+            self.frame_documents[frame_name] = document
+            frame_hash = hash(document)
+            if frame_hash != self.frame_hashes.get(frame_name):  # Page updates every few s, most fetches are repeats
+                self.frame_hashes[frame_name] = frame_hash
+                self.frame_trees[frame_name] = lxml.html.fromstring(document)
+                self.changed_frames.add(frame_name)
+        sleep(refresh_pause)
+
+    def read_snapshot(self):
+        if len(self.frame_trees) != len(self.frame_names):
+            self.refresh(refresh_pause=0)
+        changed_frames, self.changed_frames = self.changed_frames, set()
+        if 'left' in changed_frames:
+            self.raw['run_state'] = read_text(self.frame_trees['left'], self.xpaths['text']['run_state'])
+        if 'header' in changed_frames:
+            self.raw['duration'] = read_text(self.frame_trees['header'], self.xpaths['text']['duration'])
+        # Header changes every second with duration, only main frame tables count
+        self.unchanged = self.snapshot is not None and 'main' not in changed_frames and \
+            self.raw.get('run_state') is not None and self.raw.get('duration') is not None
+        self.unchanged_reads.count(self.unchanged)
+        self.changed_dets = None if 'main' in changed_frames or self.snapshot is None else set()
+        if self.unchanged:
+            if (self.raw['run_state'], self.raw['duration']) != (self.snapshot.run_state, self.snapshot.duration):
+                self.snapshot = self.snapshot._replace(run_state=self.raw['run_state'], duration=self.raw['duration'])
+            return self.snapshot
+        if 'main' in changed_frames:
+            self.raw['det'] = read_rows(self.frame_trees['main'], self.xpaths['tables']['det_rows'])
+            self.raw['trg2'] = read_rows(self.frame_trees['main'], self.xpaths['tables']['trig2_rows'])
+        self.snapshot = None  # Stays None if page is missing fields, so the same error comes up next time too
+        self.snapshot = build_snapshot(self.raw, self.xpaths)
+        return self.snapshot
+
+    def capture_frames(self):
+        return {frame_name: self.frame_documents.get(frame_name) for frame_name in self.frame_names}
+
+    def invalidate(self):
+        self.frame_hashes = {}
+        self.changed_frames = set(self.frame_trees)
+        self.raw = {}
+        self.snapshot = None
+
+    def fetch(self, url):
+        """
+        Get document at url over the pooled session and parse it
+        :param url: Url of document
+        :return: Parsed lxml html tree
+        """
+        import lxml.html
+
+        return lxml.html.fromstring(self.fetch_document(url))
+
+    def fetch_document(self, url):
+        """
+        Get document at url over the pooled session
+        :param url: Url of document
+        :return: Document bytes
+        """
+        self.commands.count('GET')
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+
+def driver_manager(browser_name):
+    """
+    :param browser_name: Browser name as in driver_managers
+    :return: webdriver_manager manager class for browser
+    """
+
+    from webdriver_manager import chrome, firefox, microsoft
+
+    return {'Firefox': firefox.GeckoDriverManager, 'Chrome': chrome.ChromeDriverManager,
+            'Edge': microsoft.EdgeChromiumDriverManager}[browser_name]
+
+
+def launch_driver(browser_name, driver):
+    """
+    Launch selenium driver in headless and silent mode
+    :param browser_name: Name of browser
+    :param driver: Driver entry like get_driver_paths
+    :return: Selenium driver
+    """
+
+    from selenium import webdriver
+
+    op = getattr(webdriver, driver['options'])()
+    op.headless = True
+    op.add_argument('--log-level=3')
+    if 'chrome' in browser_name.lower():
+        op.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return getattr(webdriver, driver['driver'])(executable_path=driver['driver_path'], options=op,
+                                                service_log_path='NUL' if 'win' in platform else '/dev/null')
+
+
+def quit_driver(driver):
+    """
+    Quit selenium driver, ignoring errors since it may already be dead
+    :param driver: Selenium driver
+    :return:
+    """
+
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def quit_probe(future):
+    """
+    Quit browser launched by a probe that lost the race
+    :param future: Future of probe_driver
+    :return:
+    """
+
+    if future.exception() is None and future.result() is not None:
+        quit_driver(future.result()[2])
+
+
+def read_driver_cache(cache_path):
+    """
+    Read browser/driver pair that last worked from driver cache
+    :param cache_path: Path to driver cache file
+    :return: Dictionary of browser name -> driver entry like get_driver_paths, None if no usable cache
+    """
+
+    try:
+        with open(cache_path, 'r') as file:
+            cache = json.load(file)
+        driver = {key: cache[key] for key in ['driver_path', 'options', 'driver']}
+        if cache['browser'] not in driver_managers or not os.path.isfile(driver['driver_path']):
+            return None  # Driver deleted or cache from another version
+        return {cache['browser']: driver}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_driver_cache(cache_path, browser_name, driver):
+    """
+    Remember browser/driver pair that worked
+    :param cache_path: Path to driver cache file
+    :param browser_name: Name of browser that worked
+    :param driver: Driver entry like get_driver_paths
+    :return:
+    """
+
+    try:
+        with open(cache_path, 'w') as file:
+            json.dump({'browser': browser_name, **driver}, file, indent=4)
+    except OSError:
+        pass  # Cache is only a startup shortcut, not worth failing over
+
+
+def read_text(tree, xpath):
+    """
+    Read text of the element at xpath in parsed document
+    :param tree: Parsed lxml html tree
+    :param xpath: xpath for element
+    :return: Stripped text of element, None if element not found
+    """
+
+    elements = tree.xpath(xpath)
+    if len(elements) == 0:
+        return None
+    return elements[0].text_content().strip()
+
+
+def read_rows(tree, xpath):
+    """
+    Read all rows of a table in parsed document as lists of [text, class] pairs, one per td cell.
+    Browsers insert tbody into tables that don't have one in their source, so fall back to xpath without tbody.
+    :param tree: Parsed lxml html tree
+    :param xpath: xpath for table rows
+    :return: List of rows, None if table not found
+    """
+
+    rows = tree.xpath(xpath)
+    if len(rows) == 0:
+        rows = tree.xpath(xpath.replace('/tbody', ''))
+    if len(rows) == 0:
+        return None
+    return [[[td.text_content().strip(), td.get('class', '')] for td in row.xpath('td')] for row in rows]
+
+
+def switch_frame(driver, xframe):
+    """
+    # Switch to xframe, returning to top level frame first. This seems to take longer than other actions?
+    :param driver: Selenium driver
+    :param xframe: Xpath of frame to switch to
+    :return:
+    """
+
+    driver.switch_to.default_content()
+    frame = driver.find_element(BY_XPATH, xframe)
+    driver.switch_to.frame(frame)
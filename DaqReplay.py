@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 4:30 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqReplay.py
+
+Replay frames recorded with record_frames through the DaqWatcher detection pipeline, as fast as it will go. Recorded
+frames are served from a local FrameServer and read with the HTTP page source (or a browser with --browser). Clock and
+sounds are replaced so dead time counting follows recorded poll times and sounds are logged instead of played.
+
+Writes <out>_decisions.txt with the status lines, sounds and screenshot decisions of every poll (diff these between
+versions) and <out>_cycles.csv with per-poll latency and command counts.
+
+Usage: python DaqReplay.py Frame_Records/frames_xx.jsonl.gz out [--browser]
+
+@author: Dylan Neff, Dylan
+"""
+
+import csv
+import argparse
+from time import perf_counter
+from itertools import chain
+
+from DaqWatcher import DaqWatcher
+from DaqPageSource import SeleniumPageSource, HttpPageSource
+from DaqFrameServer import FrameServer
+from DaqMetrics import PollGapTracker
+from PollScheduler import PollScheduler
+from FrameCapture import read_capture
+
+
+class ReplayClock:
+    """
+    Stands in for time.time, reads the recorded time of the poll being replayed
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ReplayLog:
+    """
+    Stands in for the GUI, collects status lines instead of showing them
+    """
+
+    def __init__(self):
+        self.lines = []
+
+    def print_status(self, status):
+        self.lines.append(str(status))
+
+    def watcher_event(self, event, value):
+        if event.startswith('detector'):
+            self.lines.append(f'{event} {value}')
+
+
+class SoundLog:
+    """
+    Stands in for simpleaudio playback, logs which sound starts and stops. A logged sound plays for its real length in
+    replay clock time, so alarm restart decisions come out as they would live.
+    """
+
+    def __init__(self, clock, names):
+        """
+        :param clock: ReplayClock, or time.time to log live
+        :param names: Dictionary of id(AudioSegment) -> name to log sound as
+        """
+        self.clock = clock
+        self.names = names
+        self.events = []
+        self.starts = []  # (clock time, name) of every sound started
+
+    def play(self, segment):
+        name = self.names.get(id(segment), 'unknown')
+        self.events.append(f'play {name}')
+        self.starts.append((self.clock(), name))
+        return ReplayPlayback(self, name, self.clock() + len(segment) / 1000)
+
+    def loop(self, segment):
+        name = self.names.get(id(segment), 'unknown')
+        self.events.append(f'loop {name}')
+        self.starts.append((self.clock(), name))
+        return ReplayPlayback(self, name, float('inf'))
+
+
+class ReplayPlayback:
+    """
+    Stands in for a simpleaudio PlayObject
+    """
+
+    def __init__(self, sound_log, name, end_time):
+        self.sound_log = sound_log
+        self.name = name
+        self.end_time = end_time
+        self.stopped = False
+
+    def is_playing(self):
+        return not self.stopped and self.sound_log.clock() < self.end_time
+
+    def stop(self):
+        if self.is_playing():
+            self.sound_log.events.append(f'stop {self.name}')
+        self.stopped = True
+
+
+def replay(capture_path, out_prefix, browser=False):
+    """
+    Replay a frame recording through DaqWatcher and write decisions and per-poll metrics. Uses watcher_config.ini in
+    the working directory for thresholds and alarm times, same as the watcher.
+    :param capture_path: Path to FrameRecorder file
+    :param out_prefix: Path prefix for output files
+    :param browser: If True read served frames with a headless browser, else with the HTTP page source
+    :return: Summary string
+    """
+
+    clock = ReplayClock()
+    log = ReplayLog()
+    watcher = DaqWatcher(gui=log, start_audio=False)
+    watcher.clock = clock
+    sounds = SoundLog(clock, {id(watcher.chimes): 'chimes', id(watcher.notify): 'notify',
+                              id(watcher.failure): 'failure', id(watcher.run_finished): 'run_finished'})
+    watcher.play_sound = sounds.play
+    watcher.loop_sound = sounds.loop
+    watcher.scheduler = PollScheduler(print_status=lambda status: None)  # Real time based, would differ every replay
+    watcher.poll_gaps = PollGapTracker(print_status=lambda status: None)
+
+    captures = read_capture(capture_path)
+    first_capture = next(captures, None)
+    if first_capture is None:
+        return f'No polls in {capture_path}, nothing to replay. Watcher may have been killed before first flush.'
+    first_time, first_frames = first_capture
+    clock.now = first_time
+    watcher.live_det_stamps = {x: watcher.now() for x in watcher.alarm_times}
+    poll_times, num_commands = [], []
+    with FrameServer(first_frames) as server, open(f'{out_prefix}_decisions.txt', 'w') as decisions_file, \
+            open(f'{out_prefix}_cycles.csv', 'w', newline='') as cycles_file:
+        if browser:
+            page_source = SeleniumPageSource(server.url, watcher.xpaths, log.print_status)
+        else:
+            page_source = HttpPageSource(server.url, watcher.xpaths, log.print_status)
+        if not page_source.start():
+            return '\n'.join(log.lines)
+        watcher.page_source = page_source
+        cycles = csv.writer(cycles_file)
+        watcher.timer.reset()
+        cycles.writerow(['cycle', 'time', 'poll_ms', 'process_ms', 'commands', 'running', 'dead_dets'])
+        start_time = perf_counter()
+        for cycle, (capture_time, frames) in enumerate(chain([(first_time, first_frames)], captures)):
+            clock.now = capture_time
+            server.set_frames(frames)
+            log.lines, sounds.events = [], []
+            poll_start = perf_counter()
+            try:
+                if browser:
+                    page_source.driver.refresh()  # Scripts stripped from recording, reload to pick up new frames
+                    page_source.invalidate()
+                snapshot = watcher.poll()
+                poll_end = perf_counter()
+                running, run_stopped, take_screenshot = watcher.process(snapshot)
+                if take_screenshot:
+                    watcher.trigger_shot_taken = True  # As if screenshot_trigger succeeded
+            except Exception as e:
+                watcher.det_dead_thresh = None  # Same as check_daq
+                log.print_status(f'Error reading Daq Monitor!\n{e}')
+                poll_end, running, take_screenshot = perf_counter(), False, False
+            process_end = perf_counter()
+
+            decisions_file.write(f'# poll {cycle} +{capture_time - first_time:.2f}s\n')
+            for line in log.lines + sounds.events + (['trigger screenshot'] if take_screenshot else []):
+                decisions_file.write(f'{line.strip()}\n')
+            commands = sum(page_source.commands.current.values())
+            dead_dets = sum(dead for dead in watcher.det_dead_states.values()) if running else 0
+            cycles.writerow([cycle, f'{capture_time - first_time:.3f}', f'{(poll_end - poll_start) * 1000:.2f}',
+                             f'{(process_end - poll_end) * 1000:.2f}', commands, int(running), dead_dets])
+            poll_times.append(poll_end - poll_start)
+            num_commands.append(commands)
+        replay_time = perf_counter() - start_time
+        page_source.stop()
+
+    poll_times.sort()
+    span = capture_time - first_time
+    return f'Replayed {len(poll_times)} polls spanning {span:.0f}s in {replay_time:.1f}s ' \
+           f'({span / max(replay_time, 1e-9):.0f}x real time) with {page_source.name} page source.\n' \
+           f'Poll latency mean {sum(poll_times) / len(poll_times) * 1000:.1f}ms, ' \
+           f'p95 {poll_times[int(0.95 * (len(poll_times) - 1))] * 1000:.1f}ms, max {poll_times[-1] * 1000:.1f}ms. ' \
+           f'{sum(num_commands) / len(num_commands):.1f} commands per poll. ' \
+           f'{page_source.unchanged_reads.summary()}\n{watcher.timer.summary()}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded DAQ Monitor frames through DaqWatcher')
+    parser.add_argument('capture_path', help='FrameRecorder file, from Frame_Records')
+    parser.add_argument('out_prefix', help='Prefix for _decisions.txt and _cycles.csv outputs')
+    parser.add_argument('--browser', action='store_true', help='Read served frames with a headless browser')
+    args = parser.parse_args()
+    print(replay(args.capture_path, args.out_prefix, args.browser))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 18 1:10 AM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqScreenshots.py
+
+@author: Dylan Neff, Dylan
+"""
+
+import os
+import json
+import hashlib
+from io import BytesIO
+from time import sleep, time, perf_counter
+from datetime import datetime as dt
+from threading import Lock, Timer
+from concurrent.futures import ThreadPoolExecutor
+
+from DaqPageSource import SeleniumPageSource, switch_frame, BY_XPATH
+from DaqSnapshot import DetectorLayout
+
+
+class ScreenshotStore:
+    """
+    Directory of trigger screenshots with an index file listing them, so captures can be listed without scanning the
+    directory. A capture that looks the same as the one before it (perceptual hash within dedupe_level) only bumps that
+    entry's repeat count. Kept captures are recompressed to a palette PNG, and the oldest are deleted once past
+    max_days old or once the store is over max_mb. Pillow is needed for dedupe and recompression, without it captures
+    are kept as taken.
+    """
+
+    def __init__(self, path, out_name, dt_format, max_mb=500, max_days=30, print_status=print):
+        """
+        :param path: Directory to keep screenshots and index in
+        :param out_name: File name prefix of screenshots
+        :param dt_format: Datetime format of capture time in file names
+        :param max_mb: MB Delete oldest captures once store is bigger than this
+        :param max_days: days Delete captures older than this
+        :param print_status: Function to report with
+        """
+        self.path = path
+        self.out_name = out_name
+        self.dt_format = dt_format
+        self.max_mb = max_mb
+        self.max_days = max_days
+        self.print_status = print_status
+        self.index_path = os.path.join(path, 'screenshot_index.json')
+        self.dedupe_level = 8  # Captures whose thumbnails differ by no more than this (0-255) anywhere are the same
+        self.colors = 256  # Palette size of recompressed PNGs, 0 to keep full color
+        self.entries = None  # Index entries oldest first, read from index file on first use
+        self.lock = Lock()  # Writer thread adds while GUI lists
+
+    def add(self, png, shot_time, run_duration, dead_dets):
+        """
+        Add capture to store, unless it looks the same as the last one. Runs on writer thread.
+        :param png: PNG bytes from browser
+        :param shot_time: datetime capture was requested
+        :param run_duration: Run duration string from DAQ Monitor page
+        :param dead_dets: Lower case names of detectors dead at capture time
+        :return: (path, saved) Path capture was written to and True, or path of capture it repeated and False
+        """
+        image_hash = perceptual_hash(png)
+        with self.lock:
+            self.load()
+            last = self.entries[-1] if len(self.entries) > 0 else None
+            if last is not None and hash_distance(last['hash'], image_hash) <= self.dedupe_level:
+                last['repeats'] += 1
+                last['last_time'] = shot_time.timestamp()
+                self.save()
+                return os.path.join(self.path, last['file']), False
+
+        png = recompress(png, self.colors)
+        file_name = f'{self.out_name}{dt.strftime(shot_time, self.dt_format)}.png'
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, file_name), 'wb') as file:
+            file.write(png)
+        with self.lock:
+            self.entries.append({'file': file_name, 'time': shot_time.timestamp(), 'run_duration': run_duration,
+                                 'dead_dets': dead_dets, 'bytes': len(png), 'hash': image_hash, 'repeats': 0,
+                                 'last_time': shot_time.timestamp()})
+            self.prune()
+            self.save()
+        return os.path.join(self.path, file_name), True
+
+    def prune(self):
+        """
+        Delete captures past max_days old, then oldest captures till store is within max_mb. Newest always kept.
+        :return:
+        """
+        min_time = time() - self.max_days * 24 * 60 * 60
+        total_bytes = sum(entry['bytes'] for entry in self.entries)
+        while len(self.entries) > 1 and (self.entries[0]['last_time'] < min_time or
+                                         total_bytes > self.max_mb * 1024 ** 2):
+            entry = self.entries.pop(0)
+            total_bytes -= entry['bytes']
+            try:
+                os.remove(os.path.join(self.path, entry['file']))
+            except OSError:
+                pass  # Already deleted by hand
+
+    def load(self):
+        """
+        Read index file if not read yet. If there is none, index screenshots already in directory once.
+        :return:
+        """
+        if self.entries is not None:
+            return
+        try:
+            with open(self.index_path) as file:
+                self.entries = json.load(file)
+            return
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.print_status(f'Couldn\'t read screenshot index, rebuilding it.\n{e}')
+        self.entries = []
+        if os.path.isdir(self.path):
+            for file_name in sorted(os.listdir(self.path)):
+                if not (file_name.startswith(self.out_name) and file_name.endswith('.png')):
+                    continue
+                file_path = os.path.join(self.path, file_name)
+                try:
+                    shot_time = dt.strptime(file_name[len(self.out_name):-len('.png')], self.dt_format).timestamp()
+                except ValueError:
+                    shot_time = os.path.getmtime(file_path)
+                self.entries.append({'file': file_name, 'time': shot_time, 'run_duration': None, 'dead_dets': [],
+                                     'bytes': os.path.getsize(file_path), 'hash': None, 'repeats': 0,
+                                     'last_time': shot_time})
+            self.entries.sort(key=lambda entry: entry['time'])
+            self.save()
+
+    def save(self):
+        """
+        Write index file, replacing old one only once new one is complete
+        :return:
+        """
+        os.makedirs(self.path, exist_ok=True)
+        with open(f'{self.index_path}.tmp', 'w') as file:
+            json.dump(self.entries, file)
+        os.replace(f'{self.index_path}.tmp', self.index_path)
+
+    def recent(self, num=10):
+        """
+        :param num: Number of captures to list
+        :return: Index entries of num newest captures, newest first
+        """
+        with self.lock:
+            self.load()
+            return [dict(entry) for entry in reversed(self.entries[-num:])]
+
+    def summary(self, num=10):
+        """
+        :param num: Number of captures to list
+        :return: Text listing newest captures and store size
+        """
+        entries = self.recent(num)
+        if len(entries) == 0:
+            return 'No trigger screenshots yet.'
+        with self.lock:
+            total_mb = sum(entry['bytes'] for entry in self.entries) / 1024 ** 2
+            num_total = len(self.entries)
+        lines = [f'{num_total} trigger screenshots, {total_mb:.1f} MB. Newest:']
+        for entry in entries:
+            time_str = dt.fromtimestamp(entry['time']).strftime('%m-%d %H:%M:%S')
+            repeats = f' (+{entry["repeats"]} same)' if entry['repeats'] > 0 else ''
+            dead = ', '.join(det.upper() for det in entry['dead_dets']) or '-'
+            lines.append(f'{time_str} | run {entry["run_duration"] or "unknown"} | dead {dead}{repeats}')
+        return '\n'.join(lines)
+
+
+def perceptual_hash(png):
+    """
+    Shrink to a 16x9 colour thumbnail, averaging each block of pixels, so small changes like updated numbers barely
+    change it while a row changing colour does
+    :param png: PNG bytes
+    :return: Thumbnail RGB bytes as hex string, sha1 of bytes if Pillow isn't installed
+    """
+
+    try:
+        from PIL import Image  # Optional, only needed once there's a screenshot
+    except ImportError:
+        return hashlib.sha1(png).hexdigest()
+    return Image.open(BytesIO(png)).convert('RGB').resize((16, 9), Image.BOX).tobytes().hex()
+
+
+def hash_distance(hash_a, hash_b):
+    """
+    :return: Biggest difference (0-255) of any thumbnail pixel colour between two perceptual hashes, 0 if identical
+    sha1s and 255 if they can't be compared
+    """
+
+    if hash_a is None or hash_b is None or len(hash_a) != len(hash_b):
+        return 255
+    if len(hash_a) != 16 * 9 * 3 * 2:  # sha1s, Pillow not installed
+        return 0 if hash_a == hash_b else 255
+    return max(abs(a - b) for a, b in zip(bytes.fromhex(hash_a), bytes.fromhex(hash_b)))
+
+
+def recompress(png, colors=256):
+    """
+    Re-encode PNG with a palette of colors and maximum compression. Screenshots of the DAQ Monitor have few colors so
+    this loses nothing readable.
+    :param png: PNG bytes
+    :param colors: Palette size, 0 for lossless re-encode only
+    :return: Recompressed PNG bytes, or png as is if that isn't smaller or Pillow isn't installed
+    """
+
+    try:
+        from PIL import Image
+    except ImportError:
+        return png
+    image = Image.open(BytesIO(png)).convert('RGB')
+    if colors:
+        image = image.quantize(colors=colors)
+    out = BytesIO()
+    image.save(out, format='PNG', optimize=True)
+    return out.getvalue() if out.tell() < len(png) else png
+
+
+class TriggerScreenshotter:
+    """
+    Take trigger page screenshots in a browser of its own, so the page being watched never navigates away or loses
+    focus. Captures run one at a time on a capture thread and PNGs are written to disk on a writer thread, so the watch
+    loop only hands the request over and carries on checking detectors. The browser is closed once no capture has been
+    asked for in idle_close seconds, so it doesn't sit accumulating memory between trigger deaths.
+    """
+
+    def __init__(self, xpaths, store, timer, print_status=print, idle_close=300):
+        """
+        :param xpaths: Xpaths of DAQ Monitor page, from set_xpaths
+        :param store: ScreenshotStore to keep captures in
+        :param timer: StageTimer to record capture and write times to
+        :param print_status: Function to report with, called from capture and writer threads
+        :param idle_close: s Close screenshot browser once no capture has been asked for in this long
+        """
+        self.xpaths = xpaths
+        self.store = store
+        self.timer = timer
+        self.print_status = print_status
+        self.capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screenshot')
+        self.write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screenshot_writer')
+        self.source = None  # SeleniumPageSource used only for screenshots, opened on first capture
+        self.layout = DetectorLayout()  # Button numbers on screenshot browser's page
+        self.pending = None  # Future of capture in flight
+        self.idle_close = idle_close
+        self.last_request_time = None  # time() of last capture request
+        self.idle_timer = None  # Timer that closes browser once idle
+        self.load_test_xpath = '//*[@id="tb1"]/tbody/tr[1]/td[1]'  # Present once trigger page has loaded
+
+    def request(self, shot, url, window_size):
+        """
+        Queue a trigger page screenshot and return straight away
+        :param shot: (shot_time, run_duration, dead_dets) to file capture under, see ScreenshotStore.add
+        :param url: DAQ Monitor url, opened if screenshot browser not open yet
+        :param window_size: (width, height) of screenshot browser window
+        :return: True if capture queued, False if previous capture still in flight
+        """
+        if self.pending is not None and not self.pending.done():
+            return False
+        self.last_request_time = time()
+        self.pending = self.capture_executor.submit(self.capture, shot, url, window_size)
+        self.pending.add_done_callback(lambda future: self.schedule_idle_close())
+        return True
+
+    def schedule_idle_close(self):
+        """
+        Close browser idle_close from now, unless another capture is asked for before then
+        :return:
+        """
+        if self.idle_timer is not None:
+            self.idle_timer.cancel()
+        self.idle_timer = Timer(self.idle_close, lambda: self.capture_executor.submit(self.close_idle))
+        self.idle_timer.daemon = True
+        self.idle_timer.start()
+
+    def close_idle(self):
+        """
+        Close browser if no capture has been asked for in idle_close. Runs on capture thread, so never mid capture.
+        :return:
+        """
+        if self.source is not None and time() - self.last_request_time >= self.idle_close:
+            self.print_status(f'No trigger screenshots for {self.idle_close / 60:.0f} min, closing screenshot browser.')
+            self.close()
+
+    def capture(self, shot, url, window_size):
+        """
+        Go to trigger page in screenshot browser, grab PNG, hand it to writer and go back to monitoring page. Runs on
+        capture thread.
+        :param shot: (shot_time, run_duration, dead_dets) to file capture under
+        :param url: DAQ Monitor url
+        :param window_size: (width, height) of screenshot browser window
+        :return:
+        """
+        from selenium.common.exceptions import NoSuchElementException  # Only once a browser is needed
+        start = perf_counter()
+        try:
+            driver = self.get_driver(url, window_size)
+            if driver is None:
+                self.print_status('No browser available for trigger screenshot, skipping.')
+                return
+            det_num = self.layout.button(driver, 'trigger', self.xpaths['frames']['main'])
+            if det_num is None:
+                self.print_status('No trigger button on DAQ Monitor page, skipping screenshot.')
+                return
+            switch_frame(driver, self.xpaths['frames']['main'])
+            try:
+                driver.find_element(BY_XPATH, self.xpaths['buttons']['detector'](det_num)).click()  # Go to trigger page
+            except NoSuchElementException:
+                self.layout.buttons = None  # Buttons changed since they were read, read again next time
+                self.print_status('Trigger button moved, skipping screenshot.')
+                return
+            attempt = 0
+            while attempt < 500:  # Give up after 500 tries
+                try:
+                    driver.find_element(BY_XPATH, self.load_test_xpath)
+                    break
+                except NoSuchElementException:
+                    switch_frame(driver, self.xpaths['frames']['main'])
+                    sleep(0.01)  # Wait for page to load
+                    attempt += 1
+            png = driver.get_screenshot_as_png()
+            self.timer.record('shot_capture', perf_counter() - start)
+            self.write_executor.submit(self.write, png, shot)
+            switch_frame(driver, self.xpaths['frames']['left'])
+            driver.find_element(BY_XPATH, self.xpaths['buttons']['monitoring']).click()  # Back to main monitor page
+        except Exception as e:
+            self.print_status(f'Error taking trigger screenshot, closing screenshot browser!\n{e}')
+            self.close()  # Reopened fresh on next capture
+
+    def write(self, png, shot):
+        """
+        Dedupe, recompress and store PNG. Runs on writer thread.
+        :param png: PNG bytes from browser
+        :param shot: (shot_time, run_duration, dead_dets) to file capture under
+        :return:
+        """
+        start = perf_counter()
+        try:
+            shot_path, saved = self.store.add(png, *shot)
+        except Exception as e:  # Disk full, unreadable PNG, ...
+            self.print_status(f'Couldn\'t store trigger screenshot in {os.path.abspath(self.store.path)}!\n{e}')
+            return
+        self.timer.record('shot_write', perf_counter() - start)
+        if not saved:
+            self.print_status(f'\nTrigger page looks the same as {os.path.abspath(shot_path)}, not saved again\n')
+        else:
+            self.print_status(f'\nTrigger page screenshot saved to {os.path.abspath(shot_path)}\n')
+
+    def get_driver(self, url, window_size):
+        """
+        Get screenshot browser's driver, opening the browser the first time one is needed. Runs on capture thread.
+        :param url: DAQ Monitor url
+        :param window_size: (width, height) of browser window
+        :return: Selenium driver, None if no browser could be started
+        """
+        if self.source is None:
+            self.print_status('Opening browser for trigger screenshots...')
+            source = SeleniumPageSource(url, self.xpaths, self.print_status)
+            if not source.start():
+                return None
+            self.source = source  # Set before loading page so close() shuts browser if loading fails
+            self.layout.reset()
+            source.refresh(8)
+            source.driver.set_window_size(*window_size)
+        return self.source.driver
+
+    def close(self):
+        if self.source is not None:
+            self.source.stop()
+            self.source = None
+
+    def stop(self):
+        """
+        Close screenshot browser once any capture in flight finishes, then wait for queued writes
+        :return:
+        """
+        if self.idle_timer is not None:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+        self.capture_executor.submit(self.close).result()
+        self.write_executor.submit(lambda: None).result()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 9:12 AM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqSnapshot.py
+
+@author: Dylan Neff, Dylan
+"""
+
+from collections import namedtuple
+
+
+DetRow = namedtuple('DetRow', ['name', 'dead_percent', 'class_name'])  # One row of the #det dead time table
+Trig2Row = namedtuple('Trig2Row', ['name', 'hz'])  # One row of the #trg2 trigger rate table
+DaqSnapshot = namedtuple('DaqSnapshot', ['run_state', 'duration', 'dets', 'trig2'])  # Full DAQ Monitor state
+
+# Read run state, duration and the detector/trigger tables from all frames in one round trip to the browser. Frames are
+# same origin so their documents can be reached through the top window from whichever frame driver is in. For the
+# detector and trigger tables only return rows a MutationObserver saw change since the last call. Observers are
+# installed on first call and again whenever a table is replaced or its frame reloads, in which case (or if forced) the
+# full table is returned.
+OBSERVER_SCRIPT = '''
+var xp = arguments[0], force = arguments[1];
+var document = window.top.document;
+function node(doc, xpath) {
+    return doc.evaluate(xpath, doc, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function frameDoc(xpath) {
+    var frame = node(document, xpath);
+    return frame === null ? null : frame.contentDocument;
+}
+function text(doc, xpath) {
+    if (doc === null) { return null; }
+    var ele = node(doc, xpath);
+    return ele === null ? null : ele.innerText.trim();
+}
+function cells(tr) {
+    return Array.prototype.filter.call(tr.children, function (c) { return c.tagName === 'TD'; })
+        .map(function (c) { return [c.innerText.trim(), c.className]; });
+}
+function hasRows(nodes) {
+    return Array.prototype.some.call(nodes, function (n) { return n.nodeName === 'TR' || n.nodeName === 'TBODY'; });
+}
+function watch(table) {
+    if (!table.__daqWatch) {
+        var state = {dirty: {}, full: true};
+        new MutationObserver(function (mutations) {
+            mutations.forEach(function (m) {
+                if (m.type === 'childList' && (hasRows(m.addedNodes) || hasRows(m.removedNodes))) {
+                    state.full = true;  // Table shape changed
+                    return;
+                }
+                var n = m.target;
+                while (n !== null && n.nodeName !== 'TR') { n = n.parentNode; }
+                if (n === null) { state.full = true; } else { state.dirty[n.sectionRowIndex] = true; }
+            });
+        }).observe(table, {subtree: true, childList: true, characterData: true, attributes: true,
+                           attributeFilter: ['class']});
+        table.__daqWatch = state;
+    }
+    return table.__daqWatch;
+}
+function drain(doc, tableXpath, rowsXpath) {
+    if (doc === null) { return null; }
+    var table = node(doc, tableXpath);
+    if (table === null) { return null; }
+    var state = watch(table);
+    var res = doc.evaluate(rowsXpath, doc, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var out = {full: force || state.full, count: res.snapshotLength, rows: {}};
+    if (out.full) {
+        out.rows = [];
+        for (var i = 0; i < res.snapshotLength; i++) { out.rows.push(cells(res.snapshotItem(i))); }
+    } else {
+        for (var index in state.dirty) {
+            if (index < res.snapshotLength) { out.rows[index] = cells(res.snapshotItem(index)); }
+        }
+    }
+    state.dirty = {};
+    state.full = false;
+    return out;
+}
+var main = frameDoc(xp.main);
+return {
+    run_state: text(frameDoc(xp.left), xp.run_state),
+    duration: text(frameDoc(xp.header), xp.duration),
+    det: drain(main, xp.det_table, xp.det_rows),
+    trg2: drain(main, xp.trig2_table, xp.trig2_rows)
+};
+'''
+
+# Click reload in the left frame and wait until the main frame shows something new, so the read that follows sees the
+# reloaded tables instead of the ones from before the click. Something new is any mutation of the main frame document,
+# or the frame loading a new document. Gives up after arguments[1] ms. Run with execute_async_script, one round trip.
+RELOAD_SCRIPT = '''
+var xp = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var document = window.top.document;
+function node(doc, xpath) {
+    return doc.evaluate(xpath, doc, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function frameDoc(xpath) {
+    var frame = node(document, xpath);
+    return frame === null ? null : frame.contentDocument;
+}
+var start = Date.now(), finished = false, observer = null, timer = null;
+function finish(updated) {
+    if (finished) { return; }
+    finished = true;
+    if (observer !== null) { observer.disconnect(); }
+    clearInterval(timer);
+    done({updated: updated, ms: Date.now() - start});
+}
+var main = frameDoc(xp.main), left = frameDoc(xp.left);
+var button = left === null ? null : node(left, xp.refresh);
+if (button === null) { finish(false); return; }
+if (main !== null && main.documentElement !== null) {
+    observer = new MutationObserver(function () { finish(true); });
+    observer.observe(main.documentElement, {subtree: true, childList: true, characterData: true, attributes: true});
+}
+timer = setInterval(function () {
+    var now = frameDoc(xp.main);
+    if (now !== main && now !== null && now.readyState === 'complete') { finish(true); }  // Frame reloaded
+    else if (Date.now() - start > timeout) { finish(false); }
+}, 5);
+button.click();
+'''
+
+# Current documents of the left, main and header frames as html, scripts removed so they can be served back as static
+# pages for replay without reaching out to the live server.
+FRAMES_SCRIPT = '''
+var xp = arguments[0];
+var document = window.top.document;
+var out = {};
+['left', 'main', 'header'].forEach(function (name) {
+    var frame = document.evaluate(xp[name], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (frame === null || frame.contentDocument === null) { out[name] = null; return; }
+    var root = frame.contentDocument.documentElement.cloneNode(true);
+    Array.prototype.forEach.call(root.querySelectorAll('script'), function (s) { s.parentNode.removeChild(s); });
+    out[name] = '<!DOCTYPE html>\\n' + root.outerHTML;
+});
+return out;
+'''
+
+
+# Numbers n of the det_n buttons in the main frame, by lower case detector name on the button, in one round trip.
+DET_BUTTONS_SCRIPT = '''
+var frame = window.top.document.evaluate(arguments[0], window.top.document, null,
+                                         XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+var out = {};
+if (frame === null) { return out; }
+Array.prototype.forEach.call(frame.contentDocument.querySelectorAll('[id^="det_"]'), function (e) {
+    var match = /^det_([0-9]+)$/.exec(e.id);
+    if (match !== null) { out[e.innerText.trim().toLowerCase()] = parseInt(match[1]); }
+});
+return out;
+'''
+
+
+class DetectorLayout:
+    """
+    Index of the detector table: lower case detector name -> its row in snapshot.dets and the number of its det_n
+    button. Checked against each new snapshot's detector names and rebuilt only when they change. Button numbers are
+    read from the page the first time one is needed after a rebuild.
+    """
+
+    def __init__(self):
+        self.snapshot = None  # Last snapshot checked
+        self.names = None  # Lower case detector names in table order the index was built for
+        self.rows = {}  # Lower case name -> index into snapshot.dets
+        self.buttons = None  # Lower case name -> det_n button number, None until read from page
+        self.rebuilds = 0
+
+    def update(self, snapshot):
+        """
+        Check index still matches detector table, rebuild it if table changed shape
+        :param snapshot: DaqSnapshot of current page state
+        :return: True if index was rebuilt, else False
+        """
+        if snapshot is self.snapshot:
+            return False  # Page source returned the same snapshot, nothing changed
+        self.snapshot = snapshot
+        names = tuple(det.name.lower() for det in snapshot.dets)
+        if names == self.names:
+            return False
+        self.names = names
+        self.rows = {name: row for row, name in enumerate(names)}
+        self.buttons = None
+        self.rebuilds += 1
+        return True
+
+    def button(self, driver, name, xframe):
+        """
+        Number of detector's det_n button
+        :param driver: Selenium driver on the DAQ Monitor page
+        :param name: Lower case detector name
+        :param xframe: Xpath of main frame
+        :return: Button number, None if detector has no button
+        """
+        if self.buttons is None:
+            self.buttons = driver.execute_script(DET_BUTTONS_SCRIPT, xframe)
+        return self.buttons.get(name)
+
+    def reset(self):
+        self.snapshot = None
+        self.names = None
+        self.rows = {}
+        self.buttons = None
+
+
+class SnapshotObserver:
+    """
+    Keep a copy of the DAQ Monitor tables up to date from the rows a MutationObserver in the page saw change, instead
+    of reading every row every cycle. Tells which detectors changed so only those need to be re-evaluated, and if no
+    table row changed reuses the last snapshot's rows instead of building new ones. Run state and duration (which ticks
+    every second) are taken fresh every read and don't count as a change.
+    """
+
+    def __init__(self, xpaths):
+        self.xpaths = xpaths
+        self.raw = None  # Last full page contents, same form as build_snapshot takes, patched with changes
+        self.changed_dets = None  # Lower case names of detectors whose rows changed in last read, None if all may have
+        self.snapshot = None  # Last snapshot built
+        self.unchanged = False  # True if no table row changed in last read, so last snapshot's rows were reused
+
+    def read(self, driver):
+        """
+        Drain changes from page with a single execute_script call (two if the tables need to be read in full after
+        all) and apply them to the kept copy.
+        :param driver: Selenium driver on the DAQ Monitor page
+        :return: DaqSnapshot of current page state
+        """
+        result = driver.execute_script(OBSERVER_SCRIPT, script_xpaths(self.xpaths), self.raw is None)
+        if not self.can_patch(result):
+            result = driver.execute_script(OBSERVER_SCRIPT, script_xpaths(self.xpaths), True)
+
+        raw = {'run_state': result['run_state'], 'duration': result['duration']}
+        changed_dets = set()
+        unchanged = self.snapshot is not None and self.raw is not None and \
+            raw['run_state'] is not None and raw['duration'] is not None  # Else build_snapshot to raise
+        for table in ['det', 'trg2']:
+            if result[table] is None:
+                raw[table] = None  # Table missing, build_snapshot will complain
+                unchanged = False
+            elif result[table]['full']:
+                raw[table] = result[table]['rows']
+                changed_dets = None if table == 'det' else changed_dets
+                unchanged = False
+            else:
+                raw[table] = self.raw[table]
+                unchanged = unchanged and len(result[table]['rows']) == 0
+                for index, cells in result[table]['rows'].items():
+                    if table == 'det' and changed_dets is not None:
+                        changed_dets.update(self.det_names([raw[table][int(index)], cells]))
+                    raw[table][int(index)] = cells
+
+        self.raw = raw if raw['det'] is not None and raw['trg2'] is not None else None
+        self.changed_dets = changed_dets
+        self.unchanged = unchanged
+        if not unchanged:
+            self.snapshot = None  # Stays None if page is missing fields, so the same error comes up next time too
+            self.snapshot = build_snapshot(raw, self.xpaths)
+        elif (raw['run_state'], raw['duration']) != (self.snapshot.run_state, self.snapshot.duration):
+            self.snapshot = self.snapshot._replace(run_state=raw['run_state'], duration=raw['duration'])
+        return self.snapshot
+
+    def can_patch(self, result):
+        """
+        Check if partial table changes can be applied to kept copy
+        :param result: Result of OBSERVER_SCRIPT
+        :return: True if all tables are either full or line up with kept copy, else False
+        """
+        for table in ['det', 'trg2']:
+            if result[table] is None or result[table]['full']:
+                continue
+            if self.raw is None or self.raw.get(table) is None or len(self.raw[table]) != result[table]['count']:
+                return False
+        return True
+
+    def det_names(self, rows):
+        name_col = self.xpaths['consts']['det_name_col']
+        return [row[name_col - 1][0].lower() for row in rows if len(row) >= name_col]
+
+    def reset(self):
+        self.raw = None
+        self.changed_dets = None
+        self.snapshot = None
+        self.unchanged = False
+
+
+def script_xpaths(xpaths):
+    """
+    Xpaths snapshot scripts need, flattened for passing to execute_script
+    :param xpaths: Nested dictionary of xpaths from set_xpaths
+    :return: Dictionary of name -> xpath
+    """
+
+    return {
+        'left': xpaths['frames']['left'],
+        'main': xpaths['frames']['main'],
+        'header': xpaths['frames']['header'],
+        'run_state': xpaths['text']['run_state'],
+        'duration': xpaths['text']['duration'],
+        'det_table': xpaths['tables']['det_table'],
+        'det_rows': xpaths['tables']['det_rows'],
+        'trig2_table': xpaths['tables']['trig2_table'],
+        'trig2_rows': xpaths['tables']['trig2_rows'],
+        'refresh': xpaths['buttons']['refresh'],
+    }
+
+
+def build_snapshot(raw, xpaths):
+    """
+    Convert raw page contents into a DaqSnapshot. Table rows are lists of [text, class] pairs, one per td cell.
+    :param raw: Dictionary with run_state, duration, det and trg2 entries, as patched together from OBSERVER_SCRIPT
+    :param xpaths: Nested dictionary of xpaths from set_xpaths
+    :return: DaqSnapshot of page state
+    """
+
+    for field in ['run_state', 'duration', 'det', 'trg2']:
+        if raw.get(field) is None:
+            raise ValueError(f'Could not find {field} on DAQ Monitor page')
+
+    consts = xpaths['consts']
+    dets = []
+    for cells in raw['det'][consts['det_dead_start_row'] - 1:]:
+        if len(cells) < max(consts['det_name_col'], consts['det_dead_col']):
+            continue  # Not a detector row
+        dead_text, class_name = cells[consts['det_dead_col'] - 1]
+        dets.append(DetRow(cells[consts['det_name_col'] - 1][0], parse_int(dead_text.strip('%')), class_name))
+
+    trig2 = []
+    for cells in raw['trg2'][consts['trig2_start_row'] - 1:]:
+        if len(cells) < max(consts['trig2_name_col'], consts['trig2_hz_col']):
+            continue  # Not a trigger row
+        trig2.append(Trig2Row(cells[consts['trig2_name_col'] - 1][0], parse_int(cells[consts['trig2_hz_col'] - 1][0])))
+
+    return DaqSnapshot(raw['run_state'], raw['duration'], dets, trig2)
+
+
+def parse_int(text):
+    """
+    Parse integer from page text
+    :param text: Text of table cell
+    :return: Integer value, None if text isn't an integer
+    """
+
+    try:
+        return int(text)
+    except ValueError:
+        return None
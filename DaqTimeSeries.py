@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 3:20 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqTimeSeries.py
+
+@author: Dylan Neff, Dylan
+"""
+
+import os
+import json
+import struct
+from time import time
+from array import array
+
+import numpy as np
+
+
+# Fixed width little endian records. struct formats for writing, matching numpy dtypes for memory mapped reading.
+DET_FORMAT = '<dIHfB'  # time, run, detector index, dead %, gray (not included)
+DET_DTYPE = np.dtype([('time', '<f8'), ('run', '<u4'), ('det', '<u2'), ('dead', '<f4'), ('gray', 'u1')])
+RATE_FORMAT = '<dIHf'  # time, run, trigger index, rate Hz
+RATE_DTYPE = np.dtype([('time', '<f8'), ('run', '<u4'), ('trigger', '<u2'), ('hz', '<f4')])
+
+DET_FILE = 'det_samples.bin'
+RATE_FILE = 'rate_samples.bin'
+INDEX_FILE = 'index.json'  # Detector/trigger names for indices and run start times
+
+
+class TimeSeriesWriter:
+    """
+    Append every detector dead time and trigger rate sample to fixed width binary files. Samples for a poll are packed
+    into an array buffer and written with one call per file.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.det_file = None
+        self.rate_file = None
+        self.index = {'dets': [], 'triggers': [], 'runs': []}  # runs: list of [run number, start time]
+        self.det_indices = {}  # Detector name -> index
+        self.trigger_indices = {}  # Trigger name -> index
+        self.run = 0  # Run counter, increments each time a run start is seen
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as file:
+                self.index = json.load(file)
+        self.det_indices = {name: i for i, name in enumerate(self.index['dets'])}
+        self.trigger_indices = {name: i for i, name in enumerate(self.index['triggers'])}
+        self.run = self.index['runs'][-1][0] if len(self.index['runs']) > 0 else 0
+        self.det_file = open(os.path.join(self.directory, DET_FILE), 'ab')
+        self.rate_file = open(os.path.join(self.directory, RATE_FILE), 'ab')
+
+    def close(self):
+        for file in [self.det_file, self.rate_file]:
+            if file is not None:
+                file.close()
+        self.det_file, self.rate_file = None, None
+
+    def record(self, snapshot, new_run=False, ignore_class_name=('gray',)):
+        """
+        Append all detector dead times and trigger rates in snapshot
+        :param snapshot: DaqSnapshot read while running
+        :param new_run: True if this is the first sample of a new run
+        :param ignore_class_name: Detector class names that mean not included (gray)
+        :return:
+        """
+        now = time()
+        index_changed = False
+        if new_run or self.run == 0:
+            self.run += 1
+            self.index['runs'].append([self.run, now])
+            index_changed = True
+
+        det_buffer = array('B')
+        for det in snapshot.dets:
+            name = det.name.lower()
+            if name not in self.det_indices:
+                self.det_indices[name] = len(self.index['dets'])
+                self.index['dets'].append(name)
+                index_changed = True
+            dead = float('nan') if det.dead_percent is None else det.dead_percent
+            det_buffer.frombytes(struct.pack(DET_FORMAT, now, self.run, self.det_indices[name], dead,
+                                             det.class_name in ignore_class_name))
+
+        rate_buffer = array('B')
+        for trigger in snapshot.trig2:
+            if trigger.name not in self.trigger_indices:
+                self.trigger_indices[trigger.name] = len(self.index['triggers'])
+                self.index['triggers'].append(trigger.name)
+                index_changed = True
+            hz = float('nan') if trigger.hz is None else trigger.hz
+            rate_buffer.frombytes(struct.pack(RATE_FORMAT, now, self.run, self.trigger_indices[trigger.name], hz))
+
+        if index_changed:  # Write index first so readers never see an index they can't name
+            self.write_index()
+        self.det_file.write(det_buffer.tobytes())
+        self.rate_file.write(rate_buffer.tobytes())
+        self.det_file.flush()
+        self.rate_file.flush()
+
+    def write_index(self):
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        with open(f'{index_path}.tmp', 'w') as file:
+            json.dump(self.index, file)
+        os.replace(f'{index_path}.tmp', index_path)
+
+
+class TimeSeriesReader:
+    """
+    Read recorded samples through memory maps, so only the pages actually touched are loaded no matter how long the
+    record is. Records are in time order, so runs are contiguous and found with binary search.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE), 'r') as file:
+            self.index = json.load(file)
+        self.det_names = self.index['dets']
+        self.trigger_names = self.index['triggers']
+        self.dets = memmap_records(os.path.join(directory, DET_FILE), DET_DTYPE)
+        self.rates = memmap_records(os.path.join(directory, RATE_FILE), RATE_DTYPE)
+
+    def runs(self):
+        """
+        :return: List of (run number, start time) recorded
+        """
+        return [tuple(run) for run in self.index['runs']]
+
+    def load_run(self, run):
+        """
+        Load all samples of a run as NumPy arrays
+        :param run: Run number as in runs()
+        :return: Dictionary of arrays: det_time, det (index into det_names), dead, gray, rate_time, trigger (index into
+        trigger_names), hz
+        """
+        dets = run_slice(self.dets, run)
+        rates = run_slice(self.rates, run)
+        return {
+            'det_time': np.array(dets['time']), 'det': np.array(dets['det']), 'dead': np.array(dets['dead']),
+            'gray': np.array(dets['gray'], dtype=bool),
+            'rate_time': np.array(rates['time']), 'trigger': np.array(rates['trigger']), 'hz': np.array(rates['hz']),
+        }
+
+    def detector(self, run, name):
+        """
+        Dead time series of a single detector in a run
+        :param run: Run number as in runs()
+        :param name: Lower case detector name
+        :return: (times, dead percents, gray flags) arrays
+        """
+        dets = run_slice(self.dets, run)
+        mask = dets['det'] == self.det_names.index(name)
+        return np.array(dets['time'][mask]), np.array(dets['dead'][mask]), np.array(dets['gray'][mask], dtype=bool)
+
+
+def memmap_records(path, dtype):
+    """
+    Memory map a record file. Ignore a partially written last record.
+    :param path: Path to record file
+    :param dtype: NumPy dtype of a record
+    :return: Read only memory mapped record array, empty array if file empty or missing
+    """
+
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    num_records = size // dtype.itemsize
+    if num_records == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(num_records,))
+
+
+def run_slice(records, run):
+    """
+    Get records of one run without scanning the whole file. Run numbers only increase through the file.
+    :param records: Record array in time order
+    :param run: Run number
+    :return: View of records of run
+    """
+
+    runs = records['run']
+    return records[np.searchsorted(runs, run, side='left'):np.searchsorted(runs, run, side='right')]
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 9:40 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DaqWatchDaemon.py
+
+Run DaqWatcher as a service with no GUI, eg on a monitoring box with no display. Tk is never imported. Status lines and
+watcher state events go to the console or a log file, as plain text or as JSON lines for a log collector. Audio output
+stream is opened in the background so it doesn't hold up the first poll. Stops cleanly on Ctrl+C or SIGTERM.
+Logs how long importing and setting up the watcher took and how long after launch the first poll came.
+
+Usage: python DaqWatchDaemon.py [--json] [--log-file daq_watch.log] [--no-audio] [--browserless] [--url url]
+                                [--fanout-port port] [--run-time s]
+   or: python main.py --headless [same options]
+
+@author: Dylan Neff, Dylan
+"""
+
+from time import perf_counter
+
+launch_time = perf_counter()  # Before anything else is imported
+
+import sys
+import json
+import signal
+import logging
+import argparse
+from threading import Thread, Event
+
+
+class DaemonLog:
+    """
+    Stands in for the GUI, sends status lines and watcher state events to a logger
+    """
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def print_status(self, status):
+        for line in str(status).split('\n'):  # Status lines carry blank lines for spacing in the GUI, drop them
+            if line.strip() != '':
+                self.logger.info(line)
+
+    def watcher_event(self, event, value):
+        self.logger.info(f'{event}: {value}', extra={'event': event, 'value': value})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per log line, with event and value fields for watcher state events
+    """
+
+    def format(self, record):
+        entry = {'time': record.created, 'level': record.levelname, 'message': record.getMessage()}
+        if hasattr(record, 'event'):
+            entry.update({'event': record.event, 'value': record.value})
+        return json.dumps(entry)
+
+
+def get_logger(json_lines=False, log_file=None):
+    """
+    :param json_lines: If True log JSON lines, else plain text
+    :param log_file: Path to append log to, console if None
+    :return: Logger for DaemonLog
+    """
+
+    handler = logging.StreamHandler(sys.stdout) if log_file is None else logging.FileHandler(log_file)
+    handler.setFormatter(JsonFormatter() if json_lines else logging.Formatter('%(asctime)s %(message)s'))
+    logger = logging.getLogger('daq_watch')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch STAR DAQ Monitor without a GUI')
+    parser.add_argument('--json', action='store_true', help='Log JSON lines instead of plain text')
+    parser.add_argument('--log-file', default=None, help='Append log to this file instead of the console')
+    parser.add_argument('--no-audio', action='store_true', help='Don\'t open an audio output stream')
+    parser.add_argument('--browserless', action='store_true', help='Read page over plain HTTP whatever config says')
+    parser.add_argument('--url', default=None, help='DAQ Monitor url to watch instead of the real one')
+    parser.add_argument('--fanout-port', type=int, default=None, help='Serve thin clients on this port, 0 for off')
+    parser.add_argument('--run-time', type=float, default=0, help='s Stop after this long, 0 to run until stopped')
+    args = parser.parse_args()
+
+    log = DaemonLog(get_logger(args.json, args.log_file))
+    stop_event = Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+
+    import_start = perf_counter()
+    from DaqWatcher import DaqWatcher  # Here so its import time can be measured
+    setup_start = perf_counter()
+    watcher = DaqWatcher(gui=log, start_audio=False)
+    if args.browserless:
+        watcher.browserless = 1
+    if args.url is not None:
+        watcher.daq_url = args.url
+    if args.fanout_port is not None:
+        watcher.fanout_port = args.fanout_port
+    start_time = perf_counter()
+    log.print_status(f'Watcher imported in {(setup_start - import_start) * 1000:.0f}ms, set up in '
+                     f'{(start_time - setup_start) * 1000:.0f}ms, {(start_time - launch_time) * 1000:.0f}ms '
+                     f'after launch')
+
+    watcher.start()
+    if not args.no_audio:
+        Thread(target=watcher.start_audio, daemon=True).start()
+
+    first_poll_logged = False
+    try:
+        while not stop_event.wait(0.1):
+            if not first_poll_logged and watcher.first_poll_time is not None:
+                log.print_status(f'First poll {start_time - launch_time + watcher.first_poll_time:.2f}s after launch')
+                first_poll_logged = True
+            if watcher.state == 'stopped':
+                break  # Page source couldn't start
+            if 0 < args.run_time < perf_counter() - start_time:
+                break
+    except KeyboardInterrupt:
+        pass
+    watcher.stop()
+    if watcher.audio is not None:
+        watcher.audio.stop()
+    sys.exit(0 if first_poll_logged else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,15 +14,21 @@ from tkinter import scrolledtext, Label, Button, Entry, LEFT, Toplevel
 from sys import platform
 import os
 import subprocess
-from time import sleep
+from time import sleep, perf_counter
 from threading import Thread
+from queue import SimpleQueue, Empty
+from collections import deque
 
 from DaqWatcher import DaqWatcher
 from DaqWatchWindows import ParametersWindow, ReadmeWindow
 
 
 class DaqWatchGUI:
-    def __init__(self):
+    def __init__(self, server=None):
+        """
+        :param server: 'host:port' of a watcher serving thin clients to show, else run own watcher
+        """
+        self.remote = server is not None  # Thin client, showing another station's watcher
         self.window = None
         self.set_window()
 
@@ -45,21 +51,38 @@ class DaqWatchGUI:
         self.trigger_screenshots_button = Button(self.window, text='Trigger Screenshots', font=('arial', 10),
                                                  command=self.trigger_screenshots_click)
         self.trigger_screenshots_button.place(x=225, y=10)
+        self.timings_button = Button(self.window, text='Timings', font=('arial', 10), command=self.timings_click)
+        self.timings_button.place(x=400, y=50)
+        self.dead_dets_label = Label(self.window, text='', font=('arial', 9), fg='red')
+        self.dead_dets_label.place(x=10, y=76)
 
-        self.status_max_lines = 10000  # Number of lines at which to clear status text
-        self.status_keep_lines = 1000  # How many lines to keep when clearing status
+        self.status_max_lines = 10000  # Number of lines at which to trim status text
+        self.status_keep_lines = 1000  # How many lines to keep when trimming status
+        self.status_drain_ms = 100  # ms How often main loop applies queued watcher events and status lines
+        self.status_queue = SimpleQueue()  # Status lines from any thread, waiting for main loop
+        self.status_pending = deque(maxlen=self.status_max_lines)  # Lines taken off queue for next batch, newest kept
+        self.status_line_count = 0  # Lines in status text
+        self.event_queue = SimpleQueue()  # (event, value) state changes published by watcher, waiting for main loop
+        self.shown_state = {}  # Event -> value currently shown on buttons
+        self.dead_dets = set()  # Detectors currently shown dead
         self.click_sleep = 0.1  # s How long to sleep after a click to keep things safe
-        self.check_watcher_sleep = 0.1  # s How long to wait before updating GUI button colors
 
         self.readme_window = None
         self.parameters_window = None
 
-        self.watcher = DaqWatcher(self)
-
-        self.check_watcher_thread = Thread(target=self.check_watcher_loop, daemon=True)
-        self.check_watcher_thread.start()
+        if self.remote:
+            from DaqFanout import RemoteWatcher
+            self.watcher = RemoteWatcher(self, server)
+            self.window.title(f'DAQ Watch (client of {server})')
+        else:
+            self.watcher = DaqWatcher(self)
+        for event, value in [('state', self.watcher.state), ('silenced', self.watcher.silent),
+                             ('chimes', self.watcher.dead_chime)]:
+            self.watcher_event(event, value)
+        self.drain_events()
 
         self.window.protocol('WM_DELETE_WINDOW', self.on_close)
+        self.window.after(self.status_drain_ms, self.drain_queues)
 
         self.window.mainloop()
 
@@ -68,41 +91,12 @@ class DaqWatchGUI:
         self.window.title('DAQ Watch')
         self.window.geometry('500x300')
 
-    def check_watcher_loop(self):
-        while self.window.winfo_exists():
-            self.check_watcher()
-            sleep(self.check_watcher_sleep)
-        self.check_watcher_thread.raise_exception()
-        self.check_watcher_thread.join()
-
-    def check_watcher(self):
-        watcher_live = self.watcher.is_alive()
-        if watcher_live == 'starting':
-            self.start_stop_button.configure(bg='yellow', fg='black', text='Starting', command=self.empty_click)
-        elif watcher_live == 'stopping':
-            self.start_stop_button.configure(bg='yellow', fg='black', text='Stopping', command=self.empty_click)
-        elif watcher_live:
-            self.start_stop_button.configure(bg='red', fg='white', text='Stop', command=self.stop_click)
-        else:
-            self.start_stop_button.configure(bg='green', fg='white', text='Start', command=self.start_click)
-
-        if self.watcher.silent:
-            self.silence_button.configure(text='Unsilence', bg='yellow', fg='black')
-        else:
-            self.silence_button.configure(text='Silence', bg='blue', fg='white')
-
-        if self.watcher.dead_chime:
-            self.chimes_button.configure(text='Chimes Are On', bg='green')
-        else:
-            self.chimes_button.configure(text='Chimes Are Off', bg='red')
-
     def start_click(self):
         if self.watcher.is_alive():
             self.print_status('Watcher instance already live!')
         else:
-            daq_watch_thread = Thread(target=self.watcher.start, daemon=True)
-            daq_watch_thread.start()
-            self.check_watcher()
+            self.watcher.start()  # Only schedules watching on the engine loop, returns straight away
+            self.drain_events()
             sleep(self.click_sleep)  # Don't let user click again before watcher.is_alive() has a chance to change state
 
     def stop_click(self):
@@ -111,7 +105,6 @@ class DaqWatchGUI:
             stop_thread.start()
         else:
             self.print_status('No live watchers to stop!')
-        self.check_watcher()
         sleep(self.click_sleep)  # Don't let user click again before watcher.is_alive() has a chance to change state
 
     def silence_click(self):  # Need to indicate persistently on GUI whether silenced or not. Ideally button color.
@@ -119,16 +112,12 @@ class DaqWatchGUI:
             self.watcher.unsilence()
         else:
             self.watcher.silence()
-        self.check_watcher()
+        self.drain_events()
         sleep(self.click_sleep)  # Don't let user click again till state switched
 
     def chimes_click(self):
-        if self.watcher.dead_chime:
-            self.watcher.dead_chime = False
-            self.chimes_button.configure(text='Chimes Are Off', bg='red')
-        else:
-            self.watcher.dead_chime = True
-            self.chimes_button.configure(text='Chimes Are On', bg='green')
+        self.watcher.set_dead_chime(not self.watcher.dead_chime)
+        self.drain_events()
         sleep(self.click_sleep)  # Don't let user click again till state switched
 
     def readme_click(self):
@@ -141,9 +130,11 @@ class DaqWatchGUI:
 
     def trigger_screenshots_click(self):
         """
-        Open directory containing dead trigger screenshots
+        List newest dead trigger screenshots from index and open directory containing them
         :return:
         """
+        if not self.remote:
+            self.print_status(f'\n{self.watcher.screenshot_store.summary()}')
         path = os.path.abspath(self.watcher.screenshot_path)
         if not os.path.exists(path):
             self.print_status(f'\nTrigger Screenshot path doesn\'t exist, maybe no screenshots yet?\n{path}')
@@ -155,7 +146,21 @@ class DaqWatchGUI:
             else:
                 subprocess.Popen(['xdg-open', os.path.abspath(self.watcher.screenshot_path)])
 
+    def timings_click(self):
+        """
+        Print how long each stage of the watch loop has been taking
+        :return:
+        """
+        self.print_status(f'\n{self.watcher.timer.summary()}\n')
+        if self.watcher.audio is not None:
+            self.print_status(f'{self.watcher.audio.summary()}\n')
+        if not self.remote and self.watcher.fanout is not None:
+            self.print_status(f'{self.watcher.fanout.summary()}\n')
+
     def parameters_click(self):
+        if self.remote:
+            self.print_status('\nParameters are set on the watcher server')
+            return
         if self.parameters_window is not None and self.parameters_window.winfo_exists():
             self.parameters_window.state('normal')
             self.parameters_window.focus_set()
@@ -167,29 +172,125 @@ class DaqWatchGUI:
         pass  # It seems like making command=None just reverts to last command. This is workaround.
 
     def print_status(self, status):
-        if self.status_text is not None:
+        """
+        Queue status line for the main loop to show. Safe from any thread and never waits on Tk.
+        :param status: Status text
+        :return:
+        """
+        self.status_queue.put(status)
+
+    def watcher_event(self, event, value):
+        """
+        Queue watcher state change for the main loop to apply. Safe from any thread and never waits on Tk.
+        :param event: 'state', 'silenced', 'chimes', 'detector_dead' or 'detector_alive'
+        :param value: New state, True/False or detector name
+        :return:
+        """
+        self.event_queue.put((event, value))
+
+    def drain_queues(self):
+        """
+        Apply queued watcher events and status lines, then come back after status_drain_ms. Runs on main loop.
+        :return:
+        """
+        if self.window is None or self.status_text is None:
+            return
+        self.drain_events()
+        self.drain_status()
+        self.window.after(self.status_drain_ms, self.drain_queues)
+
+    def drain_events(self):
+        """
+        Apply queued watcher events, reconfiguring only the widgets whose state actually changed. Runs on main loop.
+        :return:
+        """
+        changes, dead_dets = {}, set(self.dead_dets)
+        while True:
+            try:
+                event, value = self.event_queue.get_nowait()
+            except Empty:
+                break
+            if event == 'detector_dead':
+                dead_dets.add(value)
+            elif event == 'detector_alive':
+                dead_dets.discard(value)
+            else:
+                changes[event] = value
+                if event == 'state' and value in ['starting', 'stopped']:
+                    dead_dets.clear()  # Dead times start over on start
+        for event, value in changes.items():
+            if self.shown_state.get(event) != value:
+                self.shown_state[event] = value
+                self.show_state(event, value)
+        if dead_dets != self.dead_dets:
+            self.dead_dets = dead_dets
+            dead_text = ', '.join(sorted(det.upper() for det in dead_dets))
+            self.dead_dets_label.configure(text=f'Dead: {dead_text}' if dead_text else '')
+
+    def show_state(self, event, value):
+        """
+        Configure button to show new watcher state
+        :param event: 'state', 'silenced' or 'chimes'
+        :param value: New state
+        :return:
+        """
+        if event == 'state':
+            if value == 'starting':
+                self.start_stop_button.configure(bg='yellow', fg='black', text='Starting', command=self.empty_click)
+            elif value == 'stopping':
+                self.start_stop_button.configure(bg='yellow', fg='black', text='Stopping', command=self.empty_click)
+            elif value == 'running':
+                self.start_stop_button.configure(bg='red', fg='white', text='Stop', command=self.stop_click)
+            else:
+                self.start_stop_button.configure(bg='green', fg='white', text='Start', command=self.start_click)
+        elif event == 'silenced':
+            if value:
+                self.silence_button.configure(text='Unsilence', bg='yellow', fg='black')
+            else:
+                self.silence_button.configure(text='Silence', bg='blue', fg='white')
+        elif event == 'chimes':
+            if value:
+                self.chimes_button.configure(text='Chimes Are On', bg='green')
+            else:
+                self.chimes_button.configure(text='Chimes Are Off', bg='red')
+
+    def drain_status(self):
+        """
+        Show all queued status lines with one insert. Runs on main loop.
+        :return:
+        """
+        start = perf_counter()
+        while True:
+            try:
+                self.status_pending.append(self.status_queue.get_nowait())
+            except Empty:
+                break
+        if len(self.status_pending) > 0:
+            text = ''.join(f'{status}\n' for status in self.status_pending)
+            self.status_pending.clear()
             go_to_end = self.status_text.yview()[-1] == 1.0
-            self.status_text.insert(tk.END, f'{status}\n')
+            self.status_text.insert(tk.END, text)
+            self.status_line_count += text.count('\n')
+            if self.status_line_count > self.status_max_lines:
+                self.trim_status()
             if go_to_end:
                 self.status_text.see('end')
-            self.window.update()
-            lines = int(self.status_text.index('end-1c').split('.')[0])
-            if lines > self.status_max_lines:
-                self.clear_status()
-
-    def clear_status(self):
-        if self.status_text is not None:
-            text = self.status_text.get('1.0', tk.END)
-            text = '\n'.join(text.split('\n')[-self.status_keep_lines:])
-            self.status_text.delete('1.0', tk.END)
-            self.print_status(text)
+            self.watcher.timer.record('gui_status', perf_counter() - start)
+
+    def trim_status(self):
+        """
+        Delete oldest lines of status text down to status_keep_lines, leaving the rest in place
+        :return:
+        """
+        excess = self.status_line_count - self.status_keep_lines
+        self.status_text.delete('1.0', f'{excess + 1}.0')
+        self.status_line_count -= excess
 
     def on_close(self):
         self.window.destroy()
         self.window = None
         self.status_text = None  # Make sure everybody knows root window is dead, don't try to write anything else
         if self.watcher.is_alive():
-            stop_thread = Thread(target=self.watcher.stop, daemon=True, args=(True,))
-            stop_thread.start()
-        while self.watcher.is_alive():  # Keep main thread alive long enough for daemonic stop threads to kill driver
-            sleep(0.1)
+            self.watcher.stop(True)  # Returns once driver is closed, so main thread outlives it
+        if self.watcher.audio is not None:
+            self.watcher.audio.stop()  # Close output stream
@@ -35,11 +35,25 @@ class ReadmeWindow(Toplevel):
                                  'The "Set Parameters" button opens a window in which various parameters can be '
                                  'altered. To make a change, set the desired parameter value in the text box and click '
                                  'the "Set" button. This will set all parameters to the corresponding valuse shown in '
-                                 'the window. There is a tab for general parameters and another for the alarm times '
-                                 'for each detector\n'
-                                 '"Trigger Screenshots" button opens directory containing trigger screenshots.\n'
-                                 'The selenium webdriver this program runs on will be restarted after a run stops '
-                                 'to deal with the driver instance continuously accumulating memory usage.\n\n'
+                                 'the window. There is a tab for general parameters, one for advanced parameters '
+                                 '(browser, recording, fan-out and screenshot storage) and another for the alarm '
+                                 'times for each detector\n'
+                                 '"Trigger Screenshots" button lists the newest trigger screenshots and opens the '
+                                 'directory containing them. A screenshot that looks the same as the one before it '
+                                 'isn\'t saved again, and the oldest are deleted once past "screenshot_max_days" old or '
+                                 'over "screenshot_max_mb".\n'
+                                 '"Timings" prints how long each step of checking the DAQ Monitor has been taking. '
+                                 'These are also written to stage_timings.txt on stop.\n'
+                                 'If "browserless" is set to 1 the DAQ Monitor page is read directly over HTTP '
+                                 'without a browser.\n'
+                                 'Trigger screenshots are taken in a separate browser, opened the first time one is '
+                                 'needed, so checking continues while the screenshot is taken.\n'
+                                 'If "fanout_port" is set, other stations can run "main.py --client host:port" to '
+                                 'show this watcher\'s status and sound its alarms without reading the page '
+                                 'themselves. Silence and Chimes on a client only apply to that station.\n'
+                                 'The selenium webdriver this program runs on continuously accumulates memory. It is '
+                                 'restarted once it uses more than "driver_memory_budget" or has been open longer '
+                                 'than "driver_max_age", but only while no run is going.\n\n'
                                  'Email Dylan Neff for any issues: dneff@physics.ucla.edu')
         self.readme.pack(side=LEFT)
 
@@ -57,14 +71,17 @@ class ParametersWindow(Toplevel):
 
         super().__init__(master=root_window)
         self.title('Set DAQ Watch Parameters')
+        self.rows_y, self.row_pady = 50, 35  # y of first parameter row and spacing between rows
+        self.buttons_height = 75  # Set/Reset buttons plus notebook tab bar
         self.window_width, self.window_height = 650, 600
-        self.geometry(f'{self.window_width}x{self.window_height}')
         self.tab_control = Notebook(self)
 
         self.tab_general = Frame(self.tab_control)
+        self.tab_advanced = Frame(self.tab_control)
         self.tab_alarm_times = Frame(self.tab_control)
 
         self.tab_control.add(self.tab_general, text='General')
+        self.tab_control.add(self.tab_advanced, text='Advanced')
         self.tab_control.add(self.tab_alarm_times, text='Alarm Times')
         self.tab_control.pack(expand=1, fill='both')
 
@@ -78,19 +95,48 @@ class ParametersWindow(Toplevel):
             'trigger_screenshots': 'take_trigger_screenshots'
         }
 
+        self.advanced_vars = {
+            'browserless': 'browserless',
+            'driver_memory_budget': 'driver_memory_budget',
+            'driver_max_age': 'driver_max_age',
+            'adaptive_poll': 'adaptive_poll',
+            'record_dead_times': 'record_dead_times',
+            'record_frames': 'record_frames',
+            'fanout_port': 'fanout_port',
+            'screenshot_max_mb': 'screenshot_max_mb',
+            'screenshot_max_days': 'screenshot_max_days'
+        }
+
         self.general_descriptions = {
             'run_start_buffer': '(s) How long to wait at beginning of run before starting to watch DAQ',
             'daq_hz_minimum': '(Hz) Any total DAQ rate lower than this will sound alarm unless a '
                               'detector is dead',
             'run_duration_target': '(min) Run duration at which run stop reminder is played',
             'run_over_alarm_time': '(s) How long to keep playing run stop reminder alarm',
-            'loop_sleep': '(s) How long program sleeps after checking daq. Page only updates every ~2s.',
+            'loop_sleep': '(s) Sleep after checking daq. If adaptive_poll, only until page update timing learned.',
             'dead_threshold': '(%) Threshold above which to consider detectors dead. ',
             'trigger_screenshots': '(bool) If 1, take screenshots of trigger page if trigger dies. If 0, do not.'
         }
 
+        self.advanced_descriptions = {
+            'browserless': '(bool) If 1, read DAQ Monitor over plain HTTP, no browser. Applies on next start.',
+            'driver_memory_budget': '(MB) Restart browser between runs once it uses more memory than this',
+            'driver_max_age': '(hr) Restart browser between runs once it has been open longer than this',
+            'adaptive_poll': '(bool) If 1, check daq just after each page update and less often between runs.',
+            'record_dead_times': '(bool) If 1, record dead times and trigger rates of each page update to '
+                                 'Dead_Time_Records. Applies on next start.',
+            'record_frames': '(bool) If 1, record page frames of every poll to Frame_Records for DaqReplay.py. '
+                             'Applies on next start.',
+            'fanout_port': '(port) If not 0, serve status and alarms to thin clients (main.py --client host:port) on '
+                           'this port. Applies on next start.',
+            'screenshot_max_mb': '(MB) Delete oldest trigger screenshots once they take up more than this',
+            'screenshot_max_days': '(days) Delete trigger screenshots older than this'
+        }
+
         self.general_info = 'Set general parameters dealing with thresholds and times.\nClick "Set" to set current ' \
                             'values (for all tabs). "Reset to Defaults" returns all values to hardcoded default values.'
+        self.advanced_info = 'Set how the DAQ Monitor is read, what is recorded and how much is kept.\nClick "Set" ' \
+                             'to set current values (for all tabs).'
         self.alarm_time_info = 'Set alarm time for each detector. This is defined as the amount of time the detector ' \
                                'is dead before the alarm is sounded. All values in seconds.'
 
@@ -99,17 +145,26 @@ class ParametersWindow(Toplevel):
         self.general_entries = self.create_par_tab(self.tab_general, self.general_vars, self.general_info,
                                                    self.general_descriptions)
 
+        self.advanced_entries = self.create_par_tab(self.tab_advanced, self.advanced_vars, self.advanced_info,
+                                                    self.advanced_descriptions)
+
         self.alarm_time_entries = self.create_par_tab(self.tab_alarm_times, self.watcher.alarm_times,
                                                       self.alarm_time_info, self.alarm_time_desc, immute=False)
 
         self.tabs = [{'vars': self.general_vars, 'entries': self.general_entries, 'immute': True},
+                     {'vars': self.advanced_vars, 'entries': self.advanced_entries, 'immute': True},
                      {'vars': self.watcher.alarm_times, 'entries': self.alarm_time_entries, 'immute': False}]
 
+        # Grow window if any tab has more rows than fit, so Set and Reset buttons stay on screen
+        num_rows = max(len(tab['vars']) for tab in self.tabs)
+        self.window_height = max(self.window_height, self.rows_y + num_rows * self.row_pady + self.buttons_height)
+        self.geometry(f'{self.window_width}x{self.window_height}')
+
     def create_par_tab(self, tab, parameter_vars, info_text='', descriptions=None, immute=True):
         Label(tab, text=info_text, wraplength=self.window_width * 0.9, justify=LEFT).place(x=0, y=0)
         entries = {name: None for name in parameter_vars}
-        pady, x_name, x_entry, x_desc = 35, 0, 130, 180
-        y = 50
+        pady, x_name, x_entry, x_desc = self.row_pady, 0, 130, 180
+        y = self.rows_y
         for name, variable in parameter_vars.items():
             Label(tab, text=f'{name}:', width=17, anchor='e').place(x=x_name, y=y)
             entries[name] = Entry(tab, width=7)
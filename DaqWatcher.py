@@ -9,27 +9,56 @@ Created as STAR_DAQ_Watch/DaqWatcher
 """
 
 import os
-from sys import platform
-import logging
-from time import sleep
+from time import time, perf_counter
+from threading import Thread, Event, Lock, current_thread
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from datetime import datetime as dt, timedelta
 import configparser
 
-import selenium.common.exceptions
-from selenium.common.exceptions import WebDriverException, NoSuchElementException
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from webdriver_manager import chrome, firefox, microsoft
-
-from pydub import AudioSegment
-from pydub.playback import _play_with_simpleaudio
+from DaqAudio import LoopedPlayback, load_sounds, play_clip
+from DaqPageSource import SeleniumPageSource, HttpPageSource
+from DaqSnapshot import DetectorLayout
+from DaqScreenshots import TriggerScreenshotter, ScreenshotStore
+from DriverRecycler import DriverRecycler
+from DaqMetrics import PollGapTracker, StageTimer, AlarmLatencyTracker
+from PollScheduler import PollScheduler
+from FrameCapture import FrameRecorder
 
 
 class DaqWatcher:
-    def __init__(self, gui=None):
-        # Webdriver and DaqWatchGUI objects
-        self.driver = None
+    def __init__(self, gui=None, start_audio=True):
+        """
+        :param gui: DaqWatchGUI or anything else with print_status and watcher_event, None to print status
+        :param start_audio: If True open audio output stream now, else wait for a call to start_audio
+        """
+        # Page source and DaqWatchGUI objects
+        self.page_source = None  # Where DAQ Monitor page is read from, set in start
+        self.screenshot_store = None  # Keeps trigger screenshots and their index, set below screenshot_path
+        self.screenshots = None  # Takes trigger screenshots in its own browser, set below xpaths
+        self.recycler = None  # Decides when to recycle page source browser, set in start
+        self.standby_source = None  # Warmed up page source waiting to be swapped in by check_daq
+        self.standby_thread = None  # Thread warming up standby_source, None if no restart in progress
+        self.standby_lock = Lock()  # Held while handing standby_source over, so stop can't miss one being set
+        self.poll_gaps = None  # Tracks time between successful polls, set in start
+        self.scheduler = None  # Times polls to page updates when adaptive_poll, set in start
+        self.timer = StageTimer()  # Rolling timings of each stage of the watch loop, reset in start
+        self.alarm_latency = AlarmLatencyTracker()  # Time from page showing a dead detector to sound, reset in start
+        self.recorder = None  # Records dead times and trigger rates each update when record_dead_times, set in start
+        self.frame_recorder = None  # Records frame documents each poll for replay when record_frames, set in start
+        self.fanout = None  # FanoutServer publishing to thin clients when fanout_port set, started on first start
+
+        # Engine. Watching runs as an asyncio task on its own event loop thread, blocking browser calls on one executor
+        self.loop = asyncio.new_event_loop()
+        Thread(target=self.loop.run_forever, daemon=True).start()
+        self.browser_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='browser')
+        self.engine_future = None  # Future of watch task
+        self.engine_done = Event()  # Set once watch task has finished, including after being cancelled
         self.gui = gui
+        self.clock = time  # Time source for dead time counting, replaced to replay recorded pages faster than real time
+        self.play_sound = play_clip  # Starts audio playback, replaced to log sounds instead when replaying
+        self.loop_sound = LoopedPlayback  # Starts looping audio playback until stopped, replaced like play_sound
 
         # All parameters below set by read_config
         self.min_run_time = None  # s If run not this old, don't check dead time yet
@@ -39,6 +68,15 @@ class DaqWatcher:
         self.refresh_sleep = None  # s How long to sleep at end of loop before refreshing page and checking again
         self.dead_thresh = None  # % Dead time above which to consider detector dead
         self.take_trigger_screenshots = None  # If 1 take trigger screenshots, else do not
+        self.browserless = None  # If 1 read DAQ Monitor over plain HTTP, else with a headless browser
+        self.driver_memory_budget = None  # MB Recycle browser between runs once it uses more memory than this
+        self.driver_max_age = None  # hr Recycle browser between runs once it has been open longer than this
+        self.adaptive_poll = None  # If 1 time polls to just after page updates, else sleep refresh_sleep between polls
+        self.record_dead_times = None  # If 1 record dead times and trigger rates of each page update while running
+        self.record_frames = None  # If 1 record frame documents of every poll to replay later
+        self.fanout_port = None  # If not 0 publish status, events, snapshots and sounds to thin clients on this port
+        self.screenshot_max_mb = None  # MB Delete oldest trigger screenshots once they take up more than this
+        self.screenshot_max_days = None  # days Delete trigger screenshots older than this
         self.alarm_times = {}  # How long to wait for each detector before sounding alarm
 
         # Read config from file, setting all above parameters. Use defaults if file read fails
@@ -49,21 +87,34 @@ class DaqWatcher:
         self.dead_chime = True  # If True play chime (not alarm) immediately after any detector goes dead
         self.silent = False  # Silence all alarms if true
         self.was_running = False
-        self.live_det_stamps = {x: dt.now() for x in self.alarm_times}
+        self.live_det_stamps = {x: self.now() for x in self.alarm_times}
         self.dead_det_times = {x: 0 for x in self.alarm_times}
         self.keep_checking_daq = False
+        self.state = 'stopped'  # Last state published to GUI: 'starting', 'running', 'stopping' or 'stopped'
         self.trigger_shot_taken = False
+        self.start_time = None  # When start was last called
+        self.first_poll_time = None  # s From start to first poll, set in check_daq
+        self.restart_time = None  # When restart last started warming up a standby page source
+        self.det_dead_states = {}  # Lower case detector name -> True if dead, as of last check_dead_dets
+        self.det_dead_thresh = None  # dead_thresh det_dead_states were evaluated with
+        self.layout = DetectorLayout()  # Detector name -> table row and button, rebuilt when table changes shape
 
         # Audio objects, hard coded
-        self.repeat_num = 1000  # To repeat notify sound for alarm, audio buffer fails if too large, 1000 still good
-        self.chimes = AudioSegment.from_file('audio_files/chimes.wav')
-        self.notify = AudioSegment.from_file('audio_files/notify.wav') * self.repeat_num
-        self.failure = AudioSegment.from_file('audio_files/chord.wav') * 20
-        self.run_finished = AudioSegment.from_file('audio_files/Alarm04.wav')
+        audio_start = time()
+        self.audio_cache_path = './audio_cache/'  # Decoded sounds, memory mapped on later starts
+        self.sounds = load_sounds(self.audio_cache_path)  # Sound name -> PcmClip
+        self.chimes, self.notify = self.sounds['chimes'], self.sounds['notify']  # Notify is alarm, looped until stopped
+        self.failure, self.run_finished = self.sounds['failure'], self.sounds['run_finished']
+        audio_mb = sum(len(x.raw_data) for x in self.sounds.values()) / 1e6
+        self.print_status(f'Sounds loaded in {(time() - audio_start) * 1000:.0f}ms, {audio_mb:.1f} MB')
+        self.audio = None  # AudioDispatcher all sounds are mixed through, set by start_audio if stream opens
+        if start_audio:
+            self.start_audio()
         self.alarm_playback = None
         self.run_timer_playback = None
 
         # Hard coded constants
+        self.daq_url = 'https://online.star.bnl.gov/daq/export/daq/'
         self.run_start_text = 'Starting run #'
         self.trig2_all_name = 'ALL'
         self.run_running_text = 'RUNNING'
@@ -74,122 +125,272 @@ class DaqWatcher:
         self.screenshot_path = './Trigger_Screenshots/'
         self.screenshot_dt_format = '%m-%d-%y_%H-%M-%S'
         self.screenshot_out_name = 'trigger_dead_'
+        self.record_path = './Dead_Time_Records/'
+        self.frame_record_path = './Frame_Records/'
+        self.timing_path = 'stage_timings.txt'  # Stage timing summary appended here on stop
+        self.reload_timeout = 0.3  # s Longest to wait after clicking reload for the page to show new data
         self.ignore_class_name = ['gray']  # Det class names to ignore, corresponds to color.
         # 'sca_red' is dead, 'running' green, 'gray' is not included, 'ready' for ready but not running
         self.xpaths = set_xpaths()
+        self.screenshot_store = ScreenshotStore(self.screenshot_path, self.screenshot_out_name, self.screenshot_dt_format,
+                                                self.screenshot_max_mb, self.screenshot_max_days, self.print_status)
+        self.screenshots = TriggerScreenshotter(self.xpaths, self.screenshot_store, self.timer, self.print_status)
 
-    def get_driver_paths(self):
+    def start_audio(self):
         """
-        Download drivers with webdriver_manager and save paths along with driver options.
+        Open one output stream to mix all sounds through. Imports numpy and sounddevice, so call from another thread to
+        keep it out of the way of the first poll. Until then, or if the stream can't be opened, each sound plays on its
+        own with simpleaudio.
         :return:
         """
-        # Attempts to suppress popup log window and geckodriver.log file, none successful.
-        os.environ['WDM_LOG'] = str(logging.NOTSET)  # Turn off webdriver_manager logs
-        os.environ['WDM_LOG_LEVEL'] = '0'  # Turn off webdriver_manager logs
-        os.environ['WDM_PROGRESS_BAR'] = str(0)  # Turn off webdriver_manager download progress bar
-
-        self.print_status(f'Downloading browser drivers...')
-        driver_paths = {
-            'Firefox':
-                {'driver_path': firefox.GeckoDriverManager().install(),
-                 'options': 'FirefoxOptions', 'driver': 'Firefox'},
-            'Chrome':
-                {'driver_path': chrome.ChromeDriverManager().install(),
-                 'options': 'ChromeOptions', 'driver': 'Chrome'},
-            'Edge':
-                {'driver_path': microsoft.EdgeChromiumDriverManager().install(),
-                 'options': 'EdgeOptions', 'driver': 'Edge'},
-        }
-        self.print_status(f'Downloaded browser drivers for {", ".join(driver_paths.keys())}')
-
-        return driver_paths
-
-    def start_driver(self, driver_paths):
+        from AudioDispatcher import AudioDispatcher
+        audio = AudioDispatcher(self.notify.frame_rate, self.notify.channels, print_status=self.print_status)
+        if audio.start():
+            self.audio = audio
+            if self.play_sound is play_clip:  # Unless replaced, eg by replay
+                self.play_sound, self.loop_sound = audio.play, audio.loop
+
+    def start_fanout(self, port):
         """
-        Get selenium driver in headless and silent mode. Try Chrome, Firefox, then Edge drivers in that order.
-        Take the first one that works
-        :param driver_paths: Dictionary of driver paths and corresponding methods for selenium
+        Start publishing to thin clients. Keeps running through stops and starts so clients stay connected.
+        :param port: TCP port to listen on, 0 for any free port
         :return:
         """
-        for browser_name, driver in driver_paths.items():
-            try:
-                op = getattr(webdriver, driver['options'])()
-                op.headless = True
-                op.add_argument('--log-level=3')
-                if 'chrome' in browser_name.lower():
-                    op.add_experimental_option('excludeSwitches', ['enable-logging'])
-                self.driver = getattr(webdriver, driver['driver'])(executable_path=driver['driver_path'], options=op,
-                                                                   service_log_path='NUL' if 'win' in platform
-                                                                   else '/dev/null')
-                self.print_status(f'Starting with {browser_name}')
-                return  # Take the first good driver and run with it.
-            except WebDriverException:
-                self.print_status(f'Couldn\'t find {browser_name} binaries (probably), trying another browser.')
-        self.print_status(f'Couldn\'t find any drivers that work, giving up.\n')
+        from DaqFanout import FanoutServer
+        fanout = FanoutServer(self.loop, port, print_status=self.print_status)
+        if fanout.start():
+            fanout.attach(self)
+            self.fanout = fanout
 
     def start(self, start_checking=True):
         """
-        Start selenium with any browser that can be found in headless mode.
-        Open STAR DAQ Monitor page and refresh until up to date (~8 times).
-        :param start_checking: If True immediately start checking daq (default). Else just open driver and return
+        Start watching on the engine event loop and return. Opens STAR DAQ Monitor page with page source, a browser in
+        headless mode unless browserless, and refreshes until up to date (~8 times).
+        :param start_checking: If True immediately start checking daq (default). Else just open page
         :return:
         """
+        if self.fanout_port and self.fanout is None:
+            self.start_fanout(int(self.fanout_port))
         self.keep_checking_daq = True
+        self.set_state('starting')
         self.print_status('\nStarting, please wait...')
-        self.start_driver(self.get_driver_paths())  # Figure out distribution then try all browsers to start self.driver
-        self.driver.get('https://online.star.bnl.gov/daq/export/daq/')
-        sleep(0.1)  # Give some time for page to load. Doesn't seem like this is needed but keep to avoid any annoyances
+        self.start_time = time()
+        self.engine_done.clear()
+        self.engine_future = asyncio.run_coroutine_threadsafe(self.watch(start_checking), self.loop)
 
-        if self.driver is not None and type(self.driver) != str:
-            click_button(self.driver, self.xpaths['frames']['left'], self.xpaths['buttons']['refresh'], 8)
-            self.live_det_stamps = {x: dt.now() for x in self.alarm_times}
+    async def watch(self, start_checking=True):
+        """
+        Engine task. Open page source then check daq until cancelled by stop.
+        :param start_checking: If True check daq after opening page, else just open page
+        :return:
+        """
+        page_source = self.new_page_source()
+        try:
+            if not await self.browser(page_source.start):
+                self.keep_checking_daq = False
+                self.set_state('stopped')
+                return
+            await self.browser(page_source.refresh, 8)
+            self.page_source = page_source
+            self.recycler = DriverRecycler(self.driver_memory_budget, self.driver_max_age, self.print_status)
+            self.poll_gaps = PollGapTracker(print_status=self.print_status)
+            self.scheduler = PollScheduler(print_status=self.print_status)
+            self.timer.reset()
+            self.alarm_latency = AlarmLatencyTracker()
+            if self.record_dead_times:
+                from DaqTimeSeries import TimeSeriesWriter  # Pulls in numpy, only when recording
+                self.recorder = TimeSeriesWriter(self.record_path)
+                self.recorder.open()
+            if self.record_frames:
+                self.frame_recorder = FrameRecorder(self.frame_record_path)
+                self.frame_recorder.open()
+            self.live_det_stamps = {x: self.now() for x in self.alarm_times}
             self.dead_det_times = {x: 0 for x in self.alarm_times}
             self.trigger_shot_taken = False
+            self.layout.reset()  # New page load, table may have a different shape
+            self.set_state('running')
             if start_checking:
-                self.check_daq()  # Check daq until keep_checking goes to false
+                await self.check_daq()  # Check daq until cancelled
+        except asyncio.CancelledError:
+            if self.page_source is not page_source:
+                self.browser_executor.submit(page_source.stop)  # Cancelled mid start, close once start finishes
+            raise
+        except Exception as e:
+            self.print_status(f'Error starting page source!\n{e}')
+            self.browser_executor.submit(page_source.stop)
+            self.keep_checking_daq = False
+            self.set_state('stopped')
+        finally:
+            self.engine_done.set()
+
+    async def browser(self, func, *args):
+        """
+        Run blocking page source/browser call on the browser executor so the engine loop stays free to be cancelled.
+        All browser calls go through the one executor thread, so they never overlap.
+        :param func: Function to call
+        :param args: Arguments to func
+        :return: Result of func
+        """
+        return await self.loop.run_in_executor(self.browser_executor, partial(func, *args))
 
     def stop(self, silent=False):
         """
-        Stop checking daq and then stop selenium driver.
+        Cancel engine task, which takes effect at its next await, then close page source and any selenium driver once
+        the browser command in flight (if any) finishes.
         :return:
         """
+        stop_time = time()
         self.keep_checking_daq = False
         if self.alarm_playback is not None and self.alarm_playback.is_playing():
             self.alarm_playback.stop()
-        if self.driver is not None:
-            if not silent:
-                self.print_status('\nStopping, wait for confirmation...')
-            sleep(self.refresh_sleep + 2)  # Wait for current loop to finish. Could make smarter later if needed.
-            if self.driver is not None:
-                try:
-                    self.driver.close()
-                    self.driver.quit()
-                except WebDriverException as e:
-                    self.print_status(f'Looks like closing the webdriver somehow failed?')
-                    self.print_status(e)
-                self.driver = None
+        engine_running = self.engine_future is not None and not self.engine_done.is_set()
+        if self.page_source is None and not engine_running:
             if not silent:
-                self.print_status('Stopped')
-        else:
+                self.print_status('\nNo running page source to stop? Doing nothing.')
+            self.set_state('stopped')
+            return
+
+        self.set_state('stopping')
+        if not silent:
+            self.print_status('\nStopping, wait for confirmation...')
+        if engine_running:
+            self.engine_future.cancel()
+            self.engine_done.wait(timeout=10)
+        cancel_time = time()
+
+        if self.page_source is not None:
             if not silent:
-                self.print_status('\nNo running driver to stop? Doing nothing.')
+                self.print_status(f'{self.page_source.name} page source: {self.page_source.commands.summary()}')
+                self.print_status(self.page_source.unchanged_reads.summary())
+                if self.page_source.reload_updates.hits + self.page_source.reload_updates.misses > 0:
+                    self.print_status(self.page_source.reload_updates.summary())
+            self.browser_executor.submit(self.page_source.stop).result()  # Queued behind any command in flight
+            self.page_source = None
+        with self.standby_lock:  # Any standby still warming sees it's no longer wanted and closes itself
+            standby_source, self.standby_source, self.standby_thread = self.standby_source, None, None
+        if standby_source is not None:
+            standby_source.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.frame_recorder is not None:
+            self.frame_recorder.close()
+            self.frame_recorder = None
+        self.screenshots.stop()  # Waits for any capture in flight
+        self.set_state('stopped')
+        if not silent:
+            if self.poll_gaps is not None:
+                self.print_status(f'Longest gap between successful polls: {self.poll_gaps.max_gap:.2f}s')
+            if self.scheduler is not None:
+                self.print_status(self.scheduler.summary())
+            if len(self.timer.samples) > 0:
+                self.timer.dump(self.timing_path)
+                self.print_status(f'Stage timings written to {os.path.abspath(self.timing_path)}')
+            if len(self.alarm_latency.finished) + len(self.alarm_latency.episodes) > 0:
+                self.print_status(self.alarm_latency.summary())
+            if self.audio is not None:
+                self.print_status(self.audio.summary())
+            self.print_status(f'Monitoring stopped {(cancel_time - stop_time) * 1000:.0f}ms after stop, '
+                              f'page source closed after {time() - stop_time:.1f}s')
+            self.print_status('Stopped')
 
     def restart(self):
-        self.print_status('\nRestarting WebDriver')
-        self.stop()
-        self.start()
+        """
+        Replace page source without a gap in monitoring if checking daq, else just stop and start. Blocks in stop, so
+        never call from the engine loop, check_daq uses warm_restart.
+        :return:
+        """
+        if not self.keep_checking_daq or self.page_source is None:
+            self.print_status('\nRestarting')
+            self.stop()
+            self.start()
+        else:
+            self.warm_restart()
+
+    def warm_restart(self):
+        """
+        Warm up a standby page source in the background and let check_daq swap it in once ready. Doesn't block, so safe
+        on the engine loop. Does nothing if stopped or stopping.
+        :return:
+        """
+        if not self.keep_checking_daq or self.page_source is None:
+            return  # Stopped while recycler check was running, nothing to restart
+        with self.standby_lock:
+            if self.standby_thread is not None:
+                return  # Standby already on its way
+            self.print_status(f'\nWarming up standby {self.page_source.name} page source...')
+            self.restart_time = time()
+            self.standby_thread = Thread(target=self.warm_standby, daemon=True)
+            self.standby_thread.start()
+
+    def warm_standby(self):
+        """
+        Start a new page source, refresh until up to date and verify it can be read. Runs off the check_daq thread.
+        :return:
+        """
+        start_time = time()
+        standby = self.new_page_source()
+        try:
+            ready = standby.start()
+            if ready:
+                standby.refresh(8)
+                standby.read_snapshot()  # Make sure page reads before trusting it
+        except Exception as e:
+            self.print_status(f'Error warming up standby page source!\n{e}')
+            ready = False
+
+        with self.standby_lock:
+            wanted = self.keep_checking_daq and self.standby_thread is current_thread()  # Else stopped since
+            if ready and wanted:
+                self.standby_source = standby  # check_daq swaps it in on next loop
+            elif wanted:
+                self.standby_thread = None
+        if ready and wanted:
+            self.print_status(f'Standby {standby.name} page source ready after {time() - start_time:.1f}s')
+            return
+
+        standby.stop()
+        if not wanted:
+            self.print_status('Watcher stopped, dropping standby page source.')
+        else:
+            self.print_status('Standby page source failed, keeping current one for now.')
+            self.recycler.defer()
+
+    def swap_standby(self):
+        """
+        If a standby page source is ready swap it in for the current one and close the old one in the background.
+        :return:
+        """
+        with self.standby_lock:
+            if self.standby_source is None:
+                return
+            old_source, self.page_source, self.standby_source = self.page_source, self.standby_source, None
+            self.standby_thread = None
+        self.recycler = DriverRecycler(self.driver_memory_budget, self.driver_max_age, self.print_status)
+        Thread(target=old_source.stop, daemon=True).start()
+        self.print_status(f'Switched to standby {self.page_source.name} page source {time() - self.restart_time:.1f}s '
+                          f'after restart, closing old one in background')
+
+    def new_page_source(self):
+        """
+        Make page source to read DAQ Monitor from. Plain HTTP if browserless, else a headless browser.
+        :return: Page source, not yet started
+        """
+        if self.browserless:
+            return HttpPageSource(self.daq_url, self.xpaths, self.print_status)
+        return SeleniumPageSource(self.daq_url, self.xpaths, self.print_status)
 
     def is_alive(self):
         """
-        Check if DaqWatcher is alive. keep_checking_daq state changes quickly while driver takes time to open/close.
-        Comparing the two can tell if in the process of stopping or starting.
+        Check if DaqWatcher is alive. keep_checking_daq state changes quickly while page source takes time to
+        open/close. Comparing the two can tell if in the process of stopping or starting.
         :return:
         """
-        if self.keep_checking_daq and self.driver is not None:
+        if self.keep_checking_daq and self.page_source is not None:
             return True
-        elif self.keep_checking_daq and self.driver is None:
+        elif self.keep_checking_daq and self.page_source is None:
             return 'starting'
-        elif self.driver is not None and not self.keep_checking_daq:
+        elif self.page_source is not None and not self.keep_checking_daq:
             return 'stopping'
         else:
             return False
@@ -198,106 +399,237 @@ class DaqWatcher:
         if self.alarm_playback is not None and self.alarm_playback.is_playing():
             self.alarm_playback.stop()
         self.silent = True
+        self.publish('silenced', True)
         self.print_status('\nSilenced')
 
     def unsilence(self):
         self.silent = False
+        self.publish('silenced', False)
         self.print_status('\nUnsilenced')
 
-    def check_daq(self):
+    def set_dead_chime(self, dead_chime):
+        """
+        Turn chime on newly dead detectors on or off
+        :param dead_chime: True to chime
+        :return:
+        """
+        self.dead_chime = dead_chime
+        self.publish('chimes', dead_chime)
+
+    def set_state(self, state):
         """
-        Check STAR DAQ Monitor page in a loop. If any detectors are dead or if trigger rate goes too low sound alarm.
-        Should try to clean this method up later.
+        Set watcher state, publishing it only if it changed
+        :param state: 'starting', 'running', 'stopping' or 'stopped'
         :return:
         """
+        if state != self.state:
+            self.state = state
+            self.publish('state', state)
+
+    def publish(self, event, value):
+        """
+        Tell GUI and any thin clients watcher state changed. Called from any thread, GUI applies it on its own main
+        loop.
+        :param event: 'state', 'silenced', 'chimes', 'detector_dead' or 'detector_alive'
+        :param value: New state, True/False or detector name
+        :return:
+        """
+        if self.gui is not None:
+            self.gui.watcher_event(event, value)
+        if self.fanout is not None:
+            self.fanout.event(event, value)
+
+    async def check_daq(self):
+        """
+        Check STAR DAQ Monitor page in a loop until cancelled. If any detectors are dead or if trigger rate goes too low
+        sound alarm. Browser calls run on the browser executor, everything else here on the engine loop.
+        :return:
+        """
+        first_poll = True
         while self.keep_checking_daq:
             try:
-                click_button(self.driver, self.xpaths['frames']['left'], self.xpaths['buttons']['refresh'],
-                             click_pause=0.3)
-                duration = read_field(self.driver, self.xpaths['frames']['header'], self.xpaths['text']['duration'])
-                running = self.check_running()
-                if self.was_running and not running:
-                    self.was_running = False
-                    break  # Restart driver after run
-                if running:
-                    self.was_running = True
-
-                run_long_engough = self.check_duration(duration)
-                if running:
-                    run_long_str = ''
-                    if not run_long_engough:
-                        run_long_str = f'. Silent till {self.min_run_time}s...'
-                    self.print_status(f'\n{dt.now().strftime(self.dt_format)} | Running. Checking dead times...'
-                                      f'{run_long_str}')
-                    try:
-                        daq_hz = self.check_daq_hz()
-                        dead_dets = self.check_dead_dets()
-                    except selenium.common.exceptions.StaleElementReferenceException:
-                        self.print_status('Stale element on page, trying again. This is normal.')
-                        continue
-                    unknown_dets = [det for det in dead_dets if det not in self.alarm_times]
-                    for det in unknown_dets:
-                        self.alarm_times.update({det: 0})  # If unknown detector, add to alarm times with 0s alarm
-                        self.dead_det_times.update({det: 0})
-                        self.live_det_stamps.update({det: dt.now()})
-
-                    for det in self.alarm_times:
-                        if det in dead_dets:
-                            if self.dead_det_times[det] == 0 and self.dead_chime and not self.silent and \
-                                    run_long_engough:
-                                _play_with_simpleaudio(self.chimes)
-                            self.dead_det_times[det] = (dt.now() - self.live_det_stamps[det]).total_seconds()
-                        else:
-                            self.dead_det_times[det] = 0
-                            self.live_det_stamps[det] = dt.now()
-
-                    alarm = False
-                    any_dead = False
-                    for det, dead_time in self.dead_det_times.items():
-                        if dead_time > 0:
-                            any_dead = True
-                            self.print_status(f'{det} dead for more than {dead_time:.2f}s!')
-                        if dead_time > self.alarm_times[det]:
-                            if (self.alarm_playback is None or not self.alarm_playback.is_playing()) and \
-                                    not self.silent and run_long_engough:
-                                self.alarm_playback = _play_with_simpleaudio(self.notify)
-                            alarm = True
-                            if det == 'trigger' and not self.trigger_shot_taken and run_long_engough and \
-                                    self.take_trigger_screenshots:
-                                self.screenshot_trigger()
-                        elif det == 'trigger':
-                            self.trigger_shot_taken = False  # Reset if trigger is not dead
-
-                    if daq_hz < self.daq_hz_thresh and not any_dead:
-                        self.print_status(f'DAQ Hz less than {self.daq_hz_thresh} Hz but all detectors alive! '
-                                          f'Beam loss?')
-                        if (self.alarm_playback is None or not self.alarm_playback.is_playing()) and not self.silent \
-                                and run_long_engough:
-                            self.alarm_playback = _play_with_simpleaudio(self.notify)
-                        alarm = True
-                    elif not any_dead:
-                        self.print_status(f'All detectors alive')
-
-                    if not alarm or not run_long_engough or self.silent:
-                        if self.alarm_playback is not None and self.alarm_playback.is_playing():
-                            self.alarm_playback.stop()
-                else:  # Not running
-                    self.live_det_stamps = {x: dt.now() for x in self.alarm_times}  # Reset dead time counters
-                    self.trigger_shot_taken = False  # Reset if trigger screenshot
-                    self.print_status(f'{dt.now().strftime(self.dt_format)} | Not running, waiting...')
-                    if self.alarm_playback is not None and self.alarm_playback.is_playing():
-                        self.alarm_playback.stop()
-                sleep(self.refresh_sleep)
+                cycle_start = perf_counter()
+                self.swap_standby()
+                with self.timer.time('poll'):  # Includes hop to browser executor and back
+                    snapshot = await self.browser(self.poll)
+                if first_poll:
+                    self.first_poll_time = time() - self.start_time
+                    self.print_status(f'First poll {self.first_poll_time:.1f}s after start')
+                    first_poll = False
+                with self.timer.time('process'):
+                    running, run_stopped, take_screenshot = self.process(snapshot)
+                with self.timer.time('recycler'):
+                    recycle = await self.browser(self.recycler.check, self.page_source.driver, running, run_stopped)
+                if recycle:
+                    self.warm_restart()  # Swap in fresh browser to free memory, only ever between runs
+                if take_screenshot:
+                    with self.timer.time('screenshot'):  # Only the hand off, capture runs on screenshot thread
+                        self.screenshot_trigger(snapshot)
+                self.poll_gaps.poll()
+                self.timer.record('cycle', perf_counter() - cycle_start)
+                sleep_time = self.scheduler.next_sleep(running, self.refresh_sleep) if self.adaptive_poll \
+                    else self.refresh_sleep
+                sleep_start = perf_counter()
+                await asyncio.sleep(sleep_time)
+                self.timer.record('wake_late', perf_counter() - sleep_start - sleep_time)
             except Exception as e:
+                self.det_dead_thresh = None  # Changes may have been drained but not evaluated
                 self.print_status(f'Error reading Daq Monitor!\n{e}')
-        if self.keep_checking_daq:
-            self.restart()  # Restart driver if loop breaks, currently only after runs.
+                await asyncio.sleep(self.refresh_sleep)  # Don't hammer page if every loop errors, lets a stop through
 
-    def print_status(self, status):
-        if self.gui is not None:
-            self.gui.print_status(status)
+    def poll(self):
+        """
+        Refresh page and read it. Runs on browser executor.
+        :return: DaqSnapshot of current page state
+        """
+        self.page_source.begin_cycle()
+        with self.timer.time('refresh'):
+            self.page_source.reload_wait(self.reload_timeout)
+        with self.timer.time('read'):
+            snapshot = self.page_source.read_snapshot()
+        if self.frame_recorder is not None:
+            with self.timer.time('record_frames'):
+                self.frame_recorder.record(self.page_source.capture_frames(), self.clock())
+        return snapshot
+
+    def process(self, snapshot):
+        """
+        Act on a freshly polled snapshot: track run state and update timing, evaluate alarms and record samples. No
+        browser calls, so this is the same whether polling the live page or replaying a recording.
+        :param snapshot: DaqSnapshot of current page state
+        :return: (running, run_stopped, take_screenshot) True if run active, if run stopped since last poll and if a
+        trigger screenshot should be taken
+        """
+        changes = self.scheduler.changes
+        self.scheduler.observe(snapshot)
+        seen_time = self.clock()
+        if self.scheduler.changes > changes and self.scheduler.update_time is not None:  # Scheduler runs on time()
+            self.alarm_latency.poll(seen_time, seen_time - (time() - self.scheduler.update_time))
         else:
-            print(status)
+            self.alarm_latency.poll(seen_time, seen_time)
+        running = self.check_running(snapshot)
+        run_stopped = self.was_running and not running
+        run_started = running and not self.was_running
+        if running != self.was_running:
+            self.poll_gaps.boundary('run start' if running else 'run stop')
+        self.was_running = running
+        take_screenshot = self.evaluate(snapshot, running)
+        if running and self.recorder is not None and (run_started or not self.page_source.unchanged):
+            self.recorder.record(snapshot, run_started, self.ignore_class_name)  # Only new samples, not repeats
+        if self.fanout is not None:
+            self.fanout.snapshot(snapshot, running)
+        return running, run_stopped, take_screenshot
+
+    def evaluate(self, snapshot, running):
+        """
+        Update dead times from snapshot, print status and start/stop alarms.
+        :param snapshot: DaqSnapshot of current page state
+        :param running: True if run is active
+        :return: True if a trigger screenshot should be taken, else False
+        """
+        take_screenshot = False
+        run_long_engough = self.check_duration(snapshot.duration)
+        if running:
+            run_long_str = ''
+            if not run_long_engough:
+                run_long_str = f'. Silent till {self.min_run_time}s...'
+            self.print_status(f'\n{self.now().strftime(self.dt_format)} | Running. Checking dead times...'
+                              f'{run_long_str}')
+            daq_hz = self.check_daq_hz(snapshot)
+            with self.timer.time('check_dead_dets'):
+                dead_dets = self.check_dead_dets(snapshot, self.page_source.changed_dets)
+            unknown_dets = [det for det in dead_dets if det not in self.alarm_times]
+            for det in unknown_dets:
+                self.alarm_times.update({det: 0})  # If unknown detector, add to alarm times with 0s alarm
+                self.dead_det_times.update({det: 0})
+                self.live_det_stamps.update({det: self.now()})
+
+            for det in self.alarm_times:
+                if det in dead_dets:
+                    if self.dead_det_times[det] == 0:
+                        self.publish('detector_dead', det)
+                        self.alarm_latency.detected(det, self.alarm_times[det], self.clock())
+                        if self.dead_chime and not self.silent and run_long_engough:
+                            self.play(self.chimes)
+                            self.alarm_latency.played('chime', det, self.clock())
+                    self.dead_det_times[det] = (self.now() - self.live_det_stamps[det]).total_seconds()
+                else:
+                    if self.dead_det_times[det] != 0:
+                        self.publish('detector_alive', det)
+                    self.dead_det_times[det] = 0
+                    self.live_det_stamps[det] = self.now()
+                    self.alarm_latency.alive(det)
+
+            alarm = False
+            any_dead = False
+            for det, dead_time in self.dead_det_times.items():
+                if dead_time > 0:
+                    any_dead = True
+                    self.print_status(f'{det} dead for more than {dead_time:.2f}s!')
+                if dead_time > self.alarm_times[det]:
+                    if (self.alarm_playback is None or not self.alarm_playback.is_playing()) and \
+                            not self.silent and run_long_engough:
+                        self.alarm_playback = self.play(self.notify, loop=True)
+                    if self.alarm_playback is not None and self.alarm_playback.is_playing():
+                        self.alarm_latency.played('alarm', det, self.clock())
+                    alarm = True
+                    if det == 'trigger' and not self.trigger_shot_taken and run_long_engough and \
+                            self.take_trigger_screenshots:
+                        take_screenshot = True
+                elif det == 'trigger':
+                    self.trigger_shot_taken = False  # Reset if trigger is not dead
+
+            if daq_hz < self.daq_hz_thresh and not any_dead:
+                self.print_status(f'DAQ Hz less than {self.daq_hz_thresh} Hz but all detectors alive! '
+                                  f'Beam loss?')
+                if (self.alarm_playback is None or not self.alarm_playback.is_playing()) and not self.silent \
+                        and run_long_engough:
+                    self.alarm_playback = self.play(self.notify, loop=True)
+                alarm = True
+            elif not any_dead:
+                self.print_status(f'All detectors alive')
+
+            if not alarm or not run_long_engough or self.silent:
+                if self.alarm_playback is not None and self.alarm_playback.is_playing():
+                    self.alarm_playback.stop()
+        else:  # Not running
+            self.live_det_stamps = {x: self.now() for x in self.alarm_times}  # Reset dead time counters
+            for det, dead_time in self.dead_det_times.items():
+                if dead_time != 0:  # Dead times start over next run, don't leave last run's dead detectors showing
+                    self.publish('detector_alive', det)
+                    self.dead_det_times[det] = 0
+                    self.alarm_latency.alive(det)
+            self.trigger_shot_taken = False  # Reset if trigger screenshot
+            self.det_dead_thresh = None  # Changes drained while not checking, evaluate all detectors next time
+            self.print_status(f'{self.now().strftime(self.dt_format)} | Not running, waiting...')
+            if self.alarm_playback is not None and self.alarm_playback.is_playing():
+                self.alarm_playback.stop()
+        return take_screenshot
+
+    def play(self, segment, loop=False):
+        """
+        Start playing audio segment without waiting for it to finish
+        :param segment: AudioSegment to play
+        :param loop: If True play segment over and over until stopped
+        :return: Playback object with is_playing and stop
+        """
+        with self.timer.time('play_sound'):
+            playback = self.loop_sound(segment) if loop else self.play_sound(segment)
+            if self.fanout is not None:
+                playback = self.fanout.sound(segment, loop, playback)
+            return playback
+
+    def now(self):
+        return dt.fromtimestamp(self.clock())
+
+    def print_status(self, status):
+        with self.timer.time('print_status'):
+            if self.gui is not None:
+                self.gui.print_status(status)
+            else:
+                print(status)
+            if self.fanout is not None:
+                self.fanout.status(status)
 
     def check_duration(self, duration):
         """
@@ -313,109 +645,77 @@ class DaqWatcher:
             if self.run_duration_min * 60 < duration < self.run_duration_min * 60 + self.run_dur_alarm_time:
                 self.print_status(f'Run duration {timedelta(seconds=duration)}, maybe time to start a new one?')
                 if self.run_timer_playback is None or not self.run_timer_playback.is_playing() and not self.silent:
-                    self.run_timer_playback = _play_with_simpleaudio(self.run_finished)
+                    self.run_timer_playback = self.play(self.run_finished)
 
             if duration > self.min_run_time:
                 return True
 
         return False
 
-    def check_running(self):
+    def check_running(self, snapshot):
         """
         Check if run state is running. If paused play run_finished notification audio
+        :param snapshot: DaqSnapshot of current page state
         :return: True if running, else false
         """
-        switch_frame(self.driver, self.xpaths['frames']['left'])
-        run_state = self.driver.find_element(By.XPATH, self.xpaths['text']['run_state']).text
-        if run_state == self.run_paused_text:
+        if snapshot.run_state == self.run_paused_text:
             if not self.silent:  # Trigger normally pauses at beginning of run, stop this alarm
                 self.print_status(f'Run paused, maybe requested number of events has been reached?')
             if self.run_timer_playback is None or not self.run_timer_playback.is_playing() and not self.silent:
-                self.run_timer_playback = _play_with_simpleaudio(self.run_finished)
-        return run_state in self.running_state_text
+                self.run_timer_playback = self.play(self.run_finished)
+        return snapshot.run_state in self.running_state_text
 
-    def check_daq_hz(self):
+    def check_daq_hz(self, snapshot):
         """
         Find and return total DAQ rate. This corresponds to the last "All" column on the monitor page.
+        :param snapshot: DaqSnapshot of current page state
         :return:
         """
-        switch_frame(self.driver, self.xpaths['frames']['main'])
-        row = 2  # Row starts at 2 on page
-        while True:
-            try:
-                trig2_name = self.driver.find_element(By.XPATH, self.xpaths['text']['trig2_name'](row)).text
-                if trig2_name == self.trig2_all_name:
-                    daq_hz = int(self.driver.find_element(By.XPATH, self.xpaths['text']['trig2_hz'](row)).text)
-                    return daq_hz
-                row += 1
-            except NoSuchElementException:
-                break  # Couldn't find element, maybe at end of table. Stop looking for more detectors
+        for trig2 in snapshot.trig2:
+            if trig2.name == self.trig2_all_name and trig2.hz is not None:
+                return trig2.hz
         self.print_status('Daq Rate not found! Bypassing low Daq Rate alarm.')
 
         return self.daq_hz_thresh + 1
 
-    def check_dead_dets(self):
+    def check_dead_dets(self, snapshot, changed_dets=None):
         """
-        Read each detector dead time. If any detector more than dead_thresh dead, return name of detector
+        Read each detector dead time. If any detector more than dead_thresh dead, return name of detector.
+        Only detectors in changed_dets are re-evaluated, the rest keep their state from the last call.
+        :param snapshot: DaqSnapshot of current page state
+        :param changed_dets: Lower case names of detectors whose rows changed since last call, None to evaluate all
         :return: List of dead detectors
         """
 
-        switch_frame(self.driver, self.xpaths['frames']['main'])
-        xpath, row = self.xpaths['text']['det_deads'], self.xpaths['consts']['det_dead_start_row']
-        dets_dead = []
-        while row >= 0:
-            try:
-                ele = self.driver.find_element(By.XPATH, xpath(row, 3))
-                if ele.get_attribute('class') not in self.ignore_class_name:  # Ignore this detector, it's probably not included (gray)
-                    dead_percent = int(ele.text.strip('%'))
-                    if dead_percent > self.dead_thresh:
-                        dets_dead.append(self.driver.find_element(By.XPATH, xpath(row, 1)).text.lower())
-                row += 1
-            except NoSuchElementException:
-                row = -1  # Flag that end of table has been reached, stop looking for more detectors
-        return dets_dead
-
-    def screenshot_trigger(self):
-        """
-        If trigger dead for longer than it's alarm time, go to trigger page and take a screenshot before returning to
-        checking daq.
+        if self.layout.update(snapshot) or changed_dets is None or self.det_dead_thresh != self.dead_thresh:
+            self.det_dead_states = {}  # Start over
+            self.det_dead_thresh = self.dead_thresh
+            changed_dets = self.layout.names
+        for name in changed_dets:
+            row = self.layout.rows.get(name)
+            if row is None:
+                continue
+            det = snapshot.dets[row]
+            # Ignore gray detectors, they're probably not included
+            self.det_dead_states[name] = det.class_name not in self.ignore_class_name and \
+                det.dead_percent is not None and det.dead_percent > self.dead_thresh
+        return [name for name, dead in self.det_dead_states.items() if dead]
+
+    def screenshot_trigger(self, snapshot):
+        """
+        If trigger dead for longer than it's alarm time, hand a trigger page screenshot to the screenshot browser and
+        carry on checking daq. Capture and disk write happen off the engine loop.
+        :param snapshot: DaqSnapshot the trigger was found dead in, for the screenshot index
         :return:
         """
-        switch_frame(self.driver, self.xpaths['frames']['main'])
-        xpath = self.xpaths['buttons']['detector']
-        xpath_test = '//*[@id="tb1"]/tbody/tr[1]/td[1]'
-        det_num = 1
-        while True:
-            try:
-                if self.driver.find_element(By.XPATH, xpath(det_num)).text.lower() == 'trigger':
-                    button = self.driver.find_element(By.XPATH, xpath(det_num))
-                    button.click()  # Go to trigger page
-                    attempt = 0
-                    while attempt < 500:  # Give up after 500 tries
-                        try:
-                            self.driver.find_element(By.XPATH, xpath_test)
-                            break
-                        except NoSuchElementException:
-                            switch_frame(self.driver, self.xpaths['frames']['main'])
-                            sleep(0.01)  # Wait for page to load
-                            attempt += 1
-                    self.driver.set_window_size(*self.screenshot_window_size)
-                    # self.driver.execute_script('document.body.style.zoom="90%"')  # Just use window size
-                    os.makedirs(self.screenshot_path, exist_ok=True)
-                    dt_str = dt.strftime(dt.now(), self.screenshot_dt_format)
-                    shot_path = f'{self.screenshot_path}{self.screenshot_out_name}{dt_str}.png'
-                    self.driver.save_screenshot(shot_path)
-                    self.print_status(f'\nTrigger page screenshot saved to {os.path.abspath(shot_path)}\n')
-                    self.trigger_shot_taken = True  # Set so another shot not taken until trigger alive again
-                    break  # Exit loop once trigger found
-                else:
-                    det_num += 1
-            except NoSuchElementException:
-                break  # Detector could not be found, ran out of det_nums, exit loop
-        switch_frame(self.driver, self.xpaths['frames']['left'])
-        monitoring_button = self.driver.find_element(By.XPATH, self.xpaths['buttons']['monitoring'])
-        monitoring_button.click()  # Go back to main monitor page
-        sleep(0.1)
+        start = perf_counter()
+        self.screenshot_store.max_mb, self.screenshot_store.max_days = self.screenshot_max_mb, self.screenshot_max_days
+        dead_dets = [det for det, dead_time in self.dead_det_times.items() if dead_time > 0]
+        if self.screenshots.request((self.now(), snapshot.duration, dead_dets), self.daq_url,
+                                    self.screenshot_window_size):
+            self.trigger_shot_taken = True  # Set so another shot not taken until trigger alive again
+            self.print_status(f'Taking trigger page screenshot in background, watch loop held '
+                              f'{(perf_counter() - start) * 1000:.2f}ms')
 
     def write_config(self):
         """
@@ -430,7 +730,16 @@ class DaqWatcher:
                              'run_over_alarm_time': str(self.run_dur_alarm_time),
                              'loop_sleep': str(self.refresh_sleep),
                              'dead_threshold': str(self.dead_thresh),
-                             'trigger_screenshots': str(self.take_trigger_screenshots)}
+                             'trigger_screenshots': str(self.take_trigger_screenshots),
+                             'browserless': str(self.browserless),
+                             'driver_memory_budget': str(self.driver_memory_budget),
+                             'driver_max_age': str(self.driver_max_age),
+                             'adaptive_poll': str(self.adaptive_poll),
+                             'record_dead_times': str(self.record_dead_times),
+                             'record_frames': str(self.record_frames),
+                             'fanout_port': str(self.fanout_port),
+                             'screenshot_max_mb': str(self.screenshot_max_mb),
+                             'screenshot_max_days': str(self.screenshot_max_days)}
 
         config['Detector Alarm Times'] = {det: str(alarm_time) for det, alarm_time in self.alarm_times.items()}
 
@@ -455,6 +764,16 @@ class DaqWatcher:
             self.refresh_sleep = float(config['General']['loop_sleep'])
             self.dead_thresh = float(config['General']['dead_threshold'])
             self.take_trigger_screenshots = float(config['General']['trigger_screenshots'])
+            # Added later, older files lack these so fall back to defaults
+            self.browserless = float(config['General'].get('browserless', '0'))
+            self.driver_memory_budget = float(config['General'].get('driver_memory_budget', '1500'))
+            self.driver_max_age = float(config['General'].get('driver_max_age', '24'))
+            self.adaptive_poll = float(config['General'].get('adaptive_poll', '1'))
+            self.record_dead_times = float(config['General'].get('record_dead_times', '0'))
+            self.record_frames = float(config['General'].get('record_frames', '0'))
+            self.fanout_port = float(config['General'].get('fanout_port', '0'))
+            self.screenshot_max_mb = float(config['General'].get('screenshot_max_mb', '500'))
+            self.screenshot_max_days = float(config['General'].get('screenshot_max_days', '30'))
 
             for det, alarm_time in config['Detector Alarm Times'].items():
                 self.alarm_times[det] = float(alarm_time)
@@ -485,6 +804,15 @@ class DaqWatcher:
         self.dead_thresh = 90.0  # % Dead time above which to consider detector dead
 
         self.take_trigger_screenshots = 1  # If 1 take trigger screenshots, else do not
+        self.browserless = 0  # If 1 read DAQ Monitor over plain HTTP, else with a headless browser
+        self.driver_memory_budget = 1500.0  # MB Recycle browser between runs once it uses more memory than this
+        self.driver_max_age = 24.0  # hr Recycle browser between runs once it has been open longer than this
+        self.adaptive_poll = 1  # If 1 time polls to just after page updates, else sleep refresh_sleep between polls
+        self.record_dead_times = 0  # If 1 record dead times and trigger rates of each page update while running
+        self.record_frames = 0  # If 1 record frame documents of every poll to replay later
+        self.fanout_port = 0  # If not 0 publish status, events, snapshots and sounds to thin clients on this port
+        self.screenshot_max_mb = 500.0  # MB Delete oldest trigger screenshots once they take up more than this
+        self.screenshot_max_days = 30.0  # days Delete trigger screenshots older than this
 
         alarm_times = {
             'tof': 30.0,
@@ -536,58 +864,25 @@ def set_xpaths():
                 'trig2_hz': lambda row: f'//*[@id="trg2"]/tbody/tr[{row}]/td[3]',
                 'det_deads': lambda row, col: f'//*[@id="det"]/tbody/tr[{row}]/td[{col}]',
             },
+        'tables':
+            {
+                'det_table': '//*[@id="det"]',
+                'det_rows': '//*[@id="det"]/tbody/tr',
+                'trig2_table': '//*[@id="trg2"]',
+                'trig2_rows': '//*[@id="trg2"]/tbody/tr',
+            },
         'consts':
             {
                 'message_time_col': 1,  # Deprecated
                 'message_text_col': 7,  # Deprecated
                 'message_first_index': 2,  # Deprecated
                 'det_dead_start_row': 2,
+                'det_name_col': 1,
+                'det_dead_col': 3,
+                'trig2_start_row': 2,
+                'trig2_name_col': 1,
+                'trig2_hz_col': 3,
             }
     }
 
     return xpaths
-
-
-def switch_frame(driver, xframe):
-    """
-    # Switch to xframe, returning to top level frame first. This seems to take longer than other actions?
-    :param driver: Selenium driver
-    :param xframe: Xpath of frame to switch to
-    :return:
-    """
-
-    driver.switch_to.default_content()
-    frame = driver.find_element(By.XPATH, xframe)
-    driver.switch_to.frame(frame)
-
-
-def click_button(driver, xframe, xbutton, num_click=1, click_pause=0.2):
-    """
-    Click button at xbutton xpath. Click num_click times with click_pause wait in between.
-    :param driver: Chrome driver to webpage
-    :param xframe: xpath for frame the button is in
-    :param xbutton: xpath for the button
-    :param num_click: Number of times to click button
-    :param click_pause: Lenghth of time to pause between button clicks (seconds)
-    :return:
-    """
-
-    switch_frame(driver, xframe)
-    button = driver.find_element(By.XPATH, xbutton)
-    for i in range(num_click):
-        button.click()
-        sleep(click_pause)
-
-
-def read_field(driver, xframe, xfield):
-    """
-    Read text of given field
-    :param driver: Chrome driver for webpage
-    :param xframe: xpath for frame field is in
-    :param xfield: xpath for field
-    :return:
-    """
-
-    switch_frame(driver, xframe)
-    field = driver.find_element(By.XPATH, xfield)
-    return field.text
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 11:40 AM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/DriverRecycler.py
+
+@author: Dylan Neff, Dylan
+"""
+
+from time import time
+
+
+class DriverRecycler:
+    """
+    Decide when to recycle the browser behind a page source. Selenium webdrivers accumulate memory until closed, so
+    sample the browser process tree's resident memory and the page's JS heap, and recycle only once over the memory
+    budget or age limit and only while no run is active.
+    """
+
+    def __init__(self, memory_budget_mb, max_age_hr, print_status=print, sample_interval=300):
+        """
+        :param memory_budget_mb: MB Recycle once browser process tree resident memory goes above this
+        :param max_age_hr: hr Recycle once browser has been open longer than this
+        :param print_status: Function to log decisions and measured memory with
+        :param sample_interval: s How often to measure memory
+        """
+        self.memory_budget_mb = memory_budget_mb
+        self.max_age_hr = max_age_hr
+        self.print_status = print_status
+        self.sample_interval = sample_interval
+        self.start_time = time()
+        self.last_sample_time = None
+        self.rss_mb = None  # MB Last measured resident memory of browser process tree
+        self.heap_mb = None  # MB Last measured JS heap of page
+        self.over_limit = False
+
+    def defer(self):
+        """
+        Hold off on recycling until the next memory sample, eg after a failed attempt to start a replacement
+        :return:
+        """
+        self.over_limit = False
+        self.last_sample_time = time()
+
+    def age_hr(self):
+        return (time() - self.start_time) / 3600
+
+    def check(self, driver, running, force_sample=False):
+        """
+        Sample memory if due and decide whether browser should be recycled now.
+        :param driver: Selenium driver to measure, None if page source has no browser
+        :param running: True if a run is active. Never recycle while running.
+        :param force_sample: Sample memory now even if sample_interval hasn't passed
+        :return: True if browser should be recycled now, else False
+        """
+        if driver is None:
+            return False
+        due = self.last_sample_time is None or time() - self.last_sample_time > self.sample_interval
+        if not (due or force_sample):
+            return self.over_limit and not running
+
+        self.last_sample_time = time()
+        self.rss_mb, self.heap_mb = measure_driver_memory(driver)
+        over_memory = self.rss_mb is not None and self.rss_mb > self.memory_budget_mb
+        over_age = self.age_hr() > self.max_age_hr
+        was_over_limit, self.over_limit = self.over_limit, over_memory or over_age
+
+        memory_str = f'Browser memory {format_mb(self.rss_mb)} (JS heap {format_mb(self.heap_mb)}), ' \
+                     f'age {self.age_hr():.1f} hr.'
+        if not self.over_limit:
+            self.print_status(f'{memory_str} Within {self.memory_budget_mb:.0f} MB / {self.max_age_hr:.0f} hr '
+                              f'limits, keeping browser.')
+        elif running:
+            if not was_over_limit or force_sample:
+                self.print_status(f'{memory_str} Over {"memory budget" if over_memory else "age limit"}, '
+                                  f'will recycle browser once run stops.')
+        else:
+            self.print_status(f'{memory_str} Over {"memory budget" if over_memory else "age limit"} and no run '
+                              f'active, recycling browser.')
+
+        return self.over_limit and not running
+
+
+def measure_driver_memory(driver):
+    """
+    Measure resident memory of the driver's whole process tree (driver + browser + renderers) and page JS heap size.
+    :param driver: Selenium driver
+    :return: (rss_mb, heap_mb), either None if it couldn't be measured
+    """
+
+    import psutil  # Only needed once there's a browser to measure
+
+    rss_mb = None
+    try:
+        driver_process = psutil.Process(driver.service.process.pid)
+        processes = [driver_process] + driver_process.children(recursive=True)
+        rss = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass  # Process exited between listing and reading, or not ours to read
+        rss_mb = rss / 1024 ** 2
+    except (AttributeError, psutil.Error):
+        pass  # Driver without a local service process, can't measure
+
+    heap_mb = None
+    try:
+        heap = driver.execute_script('return window.performance.memory ? '
+                                     'window.performance.memory.usedJSHeapSize : null;')  # Chromium browsers only
+        if heap is not None:
+            heap_mb = heap / 1024 ** 2
+    except Exception:
+        pass  # Page not reachable, memory read isn't worth an error
+
+    return rss_mb, heap_mb
+
+
+def format_mb(mb):
+    return 'unknown' if mb is None else f'{mb:.0f} MB'
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 10:50 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/FanoutBenchmark.py
+
+Measure fan-out from one watcher to many thin clients. The watcher reads a simulated monitor page over HTTP (see
+AlarmLatencyBenchmark) and serves thin clients. Clients connect from a separate process so their CPU doesn't count
+against the watcher's, and record latency from each message being sent to it arriving. For each number of clients,
+reports page requests per poll and watcher process CPU per poll (these shouldn't change with clients), time to queue
+one message on every client and fan-out latency.
+
+Usage: python FanoutBenchmark.py [--clients 0 1 10 50] [--run-time 20]
+
+@author: Dylan Neff, Dylan
+"""
+
+import sys
+import json
+import asyncio
+import argparse
+import subprocess
+from time import time, sleep, process_time
+
+from DaqWatcher import DaqWatcher
+from DaqMetrics import percentiles
+from DaqReplay import SoundLog
+from AlarmLatencyBenchmark import QuietLog, SimulatedMonitor, failure_script
+
+
+async def run_clients(port, num_clients, run_time):
+    """
+    Connect num_clients to server, print 'ready', read for run_time and print latency summary as JSON. Runs in the
+    child process.
+    :param port: Server port on localhost
+    :param num_clients: Number of clients
+    :param run_time: s How long to read for after connecting
+    :return:
+    """
+
+    latencies, counts = [], []
+
+    async def client(reader):
+        count = 0
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            latencies.append(time() - json.loads(line)['sent'])
+            count += 1
+        counts.append(count)
+
+    connections = [await asyncio.open_connection('127.0.0.1', port) for i in range(num_clients)]
+    print('ready', flush=True)
+    tasks = [asyncio.create_task(client(reader)) for reader, writer in connections]
+    await asyncio.sleep(run_time)
+    for reader, writer in connections:
+        writer.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(json.dumps({'latency': percentiles(latencies) if latencies else None, 'messages': min(counts)}))
+
+
+def run_config(num_clients, run_time, page_period):
+    """
+    Run watcher against a simulated monitor page with num_clients thin clients
+    :return: Dictionary of results
+    """
+
+    dets = ['tof', 'btow', 'trigger', 'tpx']
+    monitor = SimulatedMonitor(dets, failure_script(dets, run_time, 3.0), page_period).start()
+    watcher = DaqWatcher(gui=QuietLog(), start_audio=False)
+    watcher.browserless = 1
+    watcher.min_run_time = 0
+    watcher.take_trigger_screenshots = 0
+    watcher.record_dead_times = 0
+    watcher.record_frames = 0
+    watcher.daq_url = monitor.url
+    for det in dets:
+        watcher.alarm_times[det] = 3.0
+    sounds = SoundLog(time, {id(clip): name for name, clip in watcher.sounds.items()})
+    watcher.play_sound = sounds.play
+    watcher.loop_sound = sounds.loop
+    watcher.start_fanout(0)
+
+    clients = None
+    if num_clients > 0:
+        clients = subprocess.Popen([sys.executable, __file__, '--child', str(watcher.fanout.port), str(num_clients),
+                                    str(run_time + 1)], stdout=subprocess.PIPE, text=True)
+        clients.stdout.readline()  # Wait for all to connect
+
+    cpu_start = process_time()
+    watcher.start()
+    sleep(run_time)
+    commands = watcher.page_source.commands
+    polls, requests = commands.cycles, commands.total
+    cpu = process_time() - cpu_start
+    watcher.stop(True)
+    monitor.stop()
+
+    result = {'polls': polls, 'requests': requests / max(polls, 1), 'cpu_ms': cpu * 1000 / max(polls, 1),
+              'send': percentiles(watcher.fanout.send_times), 'messages': watcher.fanout.messages,
+              'latency': None, 'received': None}
+    if clients is not None:
+        client_result = json.loads(clients.communicate()[0])
+        result['latency'], result['received'] = client_result['latency'], client_result['messages']
+    watcher.fanout.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fan-out from one watcher to many thin clients')
+    parser.add_argument('--clients', nargs='+', type=int, default=[0, 1, 10, 50], help='Numbers of clients to run')
+    parser.add_argument('--run-time', type=float, default=20, help='s Watcher run time per number of clients')
+    parser.add_argument('--page-period', type=float, default=1.0, help='s Time between simulated page updates')
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        asyncio.run(run_clients(int(args.child[0]), int(args.child[1]), float(args.child[2])))
+        return
+
+    print(f'{"clients":>7}{"polls":>6}{"GET/poll":>9}{"cpu ms/poll":>12} | {"send us p50/p95/max":>20} | '
+          f'{"latency ms p50/p95/p99/max":>27} | {"msgs sent/min recvd":>19}')
+    for num_clients in args.clients:
+        r = run_config(num_clients, args.run_time, args.page_period)
+        send = '/'.join(f'{x * 1e6:.0f}' for x in (r['send'][0], r['send'][1], r['send'][3]))
+        latency = '-' if r['latency'] is None else '/'.join(f'{x * 1000:.2f}' for x in r['latency'])
+        received = '-' if r['received'] is None else r['received']
+        print(f'{num_clients:>7}{r["polls"]:>6}{r["requests"]:>9.1f}{r["cpu_ms"]:>12.2f} | {send:>20} | '
+              f'{latency:>27} | {str(r["messages"]) + "/" + str(received):>19}')
+
+
+if __name__ == '__main__':
+    main()
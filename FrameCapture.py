@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 4:10 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/FrameCapture.py
+
+@author: Dylan Neff, Dylan
+"""
+
+import os
+import gzip
+import json
+import zlib
+from datetime import datetime as dt
+
+
+class FrameRecorder:
+    """
+    Record the left, main and header frame documents of every poll to a gzipped json lines file, one line per poll.
+    Frames that didn't change since the previous poll are left out to keep long shifts small. Compressed stream is
+    flushed to disk every flush_polls polls, so a watcher that is killed loses at most that many polls.
+    """
+
+    def __init__(self, directory, dt_format='%m-%d-%y_%H-%M-%S', flush_polls=10):
+        self.directory = directory
+        self.dt_format = dt_format
+        self.flush_polls = flush_polls
+        self.path = None
+        self.file = None
+        self.last_frames = {}  # Frame name -> last recorded document
+        self.polls = 0  # Polls recorded to file
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f'frames_{dt.now().strftime(self.dt_format)}.jsonl.gz')
+        self.file = gzip.open(self.path, 'ab')
+        self.last_frames = {}
+        self.polls = 0
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def record(self, frames, capture_time):
+        """
+        Append one poll's frame documents
+        :param frames: Dictionary of frame name -> html document (str or bytes), None if frame couldn't be read
+        :param capture_time: Time poll was made
+        :return:
+        """
+        changed = {}
+        for name, html in frames.items():
+            if isinstance(html, bytes):
+                html = html.decode('utf-8', errors='replace')
+            if html is not None and html != self.last_frames.get(name):
+                changed[name] = html
+                self.last_frames[name] = html
+        self.file.write((json.dumps({'time': capture_time, 'frames': changed}) + '\n').encode('utf-8'))
+        if self.polls % self.flush_polls == 0:  # From first poll, so even a short capture is readable
+            self.file.flush(zlib.Z_SYNC_FLUSH)  # Everything so far decompressible without end of stream marker
+        self.polls += 1
+
+
+def read_capture(path):
+    """
+    Read a FrameRecorder file back one poll at a time
+    :param path: Path to recorded .jsonl.gz file
+    :return: Generator of (capture time, dictionary of frame name -> html document) with unchanged frames filled in
+    """
+
+    frames = {}
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        try:
+            for line in file:
+                try:
+                    poll = json.loads(line)
+                except ValueError:
+                    break  # Last line cut off if watcher was killed mid write
+                frames.update(poll['frames'])
+                yield poll['time'], dict(frames)
+        except (EOFError, OSError, zlib.error):
+            pass  # Stream ends without end of stream marker if watcher was killed, keep polls flushed before that
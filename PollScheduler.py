@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on October 17 2:05 PM 2026
+Created in PyCharm
+Created as STAR_DAQ_Watch/PollScheduler.py
+
+@author: Dylan Neff, Dylan
+"""
+
+from time import time
+
+
+class PollScheduler:
+    """
+    Decide how long to sleep between polls of the DAQ Monitor. Learn how often the page data actually changes and when,
+    then poll just after each expected update instead of on a fixed interval. Back off while no run is active.
+    """
+
+    def __init__(self, idle_interval=3.0, offset=0.15, retry_interval=0.2, nudge=0.05, min_period=0.5,
+                 max_period=10.0, print_status=print):
+        """
+        :param idle_interval: s Poll interval while no run is active
+        :param offset: s How long after expected update to poll, gives page time to show it
+        :param retry_interval: s Poll interval when expected update hasn't shown up yet
+        :param nudge: s How much earlier than expected to guess each seen update happened. Creeps polls earlier until
+        one lands before an update, which pins down when updates really happen.
+        :param min_period: s Shortest update period believed
+        :param max_period: s Longest update period believed
+        :param print_status: Function to report with
+        """
+        self.idle_interval = idle_interval
+        self.offset = offset
+        self.retry_interval = retry_interval
+        self.nudge = nudge
+        self.min_period = min_period
+        self.max_period = max_period
+        self.print_status = print_status
+
+        self.last_content = None  # (run_state, dets, trig2) of last poll, run duration left out as it ticks by itself
+        self.last_poll_time = None
+        self.update_time = None  # Estimated time of latest page update
+        self.period = None  # s Estimated time between page updates, None until learned
+        self.period_weight = 0.2  # Weight of newest interval in period moving average
+        self.polls = 0
+        self.changes = 0
+        self.staleness = []  # s Estimated age of each page update when first seen
+        self.max_staleness_samples = 10000
+
+    def observe(self, snapshot):
+        """
+        Record a successful poll. If page data changed since last poll, use time it was seen to learn update timing.
+        The run duration counts up every second on its own whether or not the tables update, so it is not compared.
+        :param snapshot: DaqSnapshot read in this poll
+        :return:
+        """
+        now = time()
+        self.polls += 1
+        content = (snapshot.run_state, snapshot.dets, snapshot.trig2)
+        if self.last_content is not None and content != self.last_content:
+            self.changes += 1
+            update_time = self.estimate_update_time(now)
+            self.staleness.append(now - update_time)
+            if len(self.staleness) > self.max_staleness_samples:
+                self.staleness = self.staleness[-self.max_staleness_samples // 2:]
+            if self.update_time is not None:
+                self.update_period(update_time - self.update_time)
+            self.update_time = update_time
+        self.last_content = content
+        self.last_poll_time = now
+
+    def estimate_update_time(self, now):
+        """
+        Estimate when the update first seen now happened. It happened after the last poll and by now. If the update
+        period is known, guess a bit earlier than the expected update time within that window.
+        :param now: Time of poll that saw update
+        :return: Estimated update time
+        """
+        if self.update_time is None or self.period is None:
+            return (self.last_poll_time + now) / 2
+        expected = self.update_time + self.period * max(1, round((now - self.update_time) / self.period))
+        return min(max(expected - self.nudge, self.last_poll_time), now)
+
+    def update_period(self, interval):
+        """
+        Fold time between two seen updates into period estimate. Intervals spanning missed updates are divided down.
+        :param interval: s Time between polls that saw consecutive changes
+        :return:
+        """
+        if self.period is not None and interval > 1.5 * self.period:
+            interval /= round(interval / self.period)
+        if not self.min_period <= interval <= self.max_period:
+            return
+        if self.period is None:
+            self.period = interval
+            self.print_status(f'Page updates about every {self.period:.2f}s, polling just after each update')
+        else:
+            self.period += self.period_weight * (interval - self.period)
+
+    def next_sleep(self, running, base_interval):
+        """
+        How long to sleep before next poll
+        :param running: True if a run is active
+        :param base_interval: s Poll interval to use until update period is learned
+        :return: s Time to sleep
+        """
+        if not running:
+            return self.idle_interval
+        if self.period is None or self.update_time is None:
+            return base_interval
+        now = time()
+        next_update = self.update_time + self.period
+        if now >= next_update + self.offset:  # Update is late, keep checking until it shows
+            if now - self.update_time > 3 * self.period:
+                self.period, self.update_time = None, None  # Lost lock, page cadence changed. Relearn.
+                return base_interval
+            return self.retry_interval
+        return next_update + self.offset - now
+
+    def summary(self):
+        if len(self.staleness) == 0:
+            return 'No page updates seen yet.'
+        period_str = 'not learned' if self.period is None else f'{self.period:.2f}s'
+        return f'Page update period {period_str}. Updates seen {sum(self.staleness) / len(self.staleness):.2f}s after ' \
+               f'they happened on average, {max(self.staleness):.2f}s at worst. ' \
+               f'{self.polls / max(self.changes, 1):.1f} polls per update.'
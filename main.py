@@ -13,17 +13,29 @@ each detector dead time is read out. If any is close above some threshold value
 If a new detector is dead, soft chime will sound to indicate if chime option is true. If a detector is dead for a
 longer period of time as defined in set_alarm_times, a louder and persistent alarm will sound. This alarm stays on
 until no detectors are found to be dead.
-Selenium webdrivers will accumulate memory until closed. Now restart webdriver after each run to fix this issue.
+Selenium webdrivers will accumulate memory until closed. Restart webdriver between runs once over a memory budget.
+Run with --headless to watch without a GUI, see DaqWatchDaemon. Run with --client host:port to show and sound alarms of
+a watcher serving thin clients (fanout_port) instead of reading the DAQ Monitor page here, see DaqFanout.
 
 @author: Dylan Neff
 """
 
-from DaqWatchGUI import DaqWatchGUI
+import sys
 
 
 def main():
-    DaqWatchGUI()
-    print('donzo')
+    if len(sys.argv) > 1 and sys.argv[1] == '--headless':  # No display, run as a service. See DaqWatchDaemon
+        from DaqWatchDaemon import main as daemon_main
+        sys.argv.pop(1)
+        daemon_main()
+    elif len(sys.argv) > 2 and sys.argv[1] == '--client':  # Thin client of a watcher with fanout_port set
+        from DaqWatchGUI import DaqWatchGUI
+        DaqWatchGUI(server=sys.argv[2])
+        print('donzo')
+    else:
+        from DaqWatchGUI import DaqWatchGUI  # Imports Tk, only for the GUI
+        DaqWatchGUI()
+        print('donzo')
 
 
 if __name__ == '__main__':